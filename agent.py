@@ -1,10 +1,21 @@
 # agent.py
 # Lógica del agente para:
-# - Modo NO INFORMADO: exploración aleatoria con backtracking (DFS random).
+# - Modo NO INFORMADO: exploración aleatoria con backtracking (DFS random),
+#   opcionalmente podando ramas que ya no llevan a la meta (bitboard.py).
 # - Modo INFORMADO: A* (heurística Manhattan) + animación de ruta (RouteFollower).
+# (BFS, greedy, A* ponderado, etc. con estadísticas: ver search.py)
+# - Costos de terreno: dial_camino (cola de cubetas) + RouteFollower con tiempo por celda.
 
+import hashlib
 import random
-from collections import deque  # reservado por si quieres añadir BFS clásico
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+import bitboard
+from grid import Grid, EMPTY, GRASS, WIN_C
 
 # -------------------- Vecinos cardinales --------------------
 def _vecinos_cardinales(x, y, grid_w, grid_h):
@@ -19,13 +30,24 @@ class RandomExplorer:
     Recorre el grid con DFS aleatorio paso a paso hasta alcanzar 'goal'.
     - Evita BRICK u otras celdas no caminables (definidas en 'walkable').
     - Marca visitados y hace backtracking cuando no hay vecinos nuevos.
-    - Se mueve cada 'step_ms' para animación visible.
+    - Se mueve cada 'step_ms' para animación visible; step() avanza una
+      celda sin reloj (simulación headless, ver sim.py).
+    - podar=True: descarta los vecinos desde los que la meta ya no se
+      alcanza sin pisar celdas visitadas, así no entra en bolsillos que su
+      propio recorrido dejó cerrados. Las celdas alcanzables desde la meta
+      se guardan como bitboard (un int por fila, así marcar una celda no
+      cuesta según el tamaño del mapa) y solo se vuelven a inundar cuando
+      la celda recién visitada corta la zona libre. 'podados' cuenta los
+      vecinos descartados.
     """
-    def __init__(self, grid, start, goal, grid_w, grid_h, walkable: set, step_ms=160):
+    def __init__(self, grid, start, goal, grid_w, grid_h, walkable: set, step_ms=160,
+                 podar: bool = False):
         self.grid = grid
         self.grid_w = grid_w
         self.grid_h = grid_h
         self.walkable = walkable
+        # con Grid: máscara plana precalculada en vez de 'in walkable'
+        self._walk = grid.walk_bytes(walkable) if isinstance(grid, Grid) else None
 
         self.cell = start
         self.goal = goal
@@ -34,11 +56,84 @@ class RandomExplorer:
         self._accum = 0
         self.step_ms = step_ms
         self.finished = False      # True cuando llega a goal o no hay más camino
+        self.steps = 0             # movimientos realizados
+        self.backtracks = 0        # movimientos de retroceso
+        self.pico_pila = 0         # profundidad máxima de la pila
+        self.visitadas = 1         # celdas distintas visitadas
+
+        self.podar = podar
+        self.podados = 0
+        if podar:
+            if isinstance(grid, Grid):
+                mask = np.frombuffer(self._walk, dtype=bool).reshape(grid_h, grid_w)
+            else:
+                mask = np.isin(np.array(grid, dtype=np.uint8), list(walkable))
+            # caminables no visitadas y, de ellas, las que llegan a la meta
+            self._libre = bitboard.filas_desde_mascara(mask)
+            self._libre[start[1]] &= ~(1 << start[0])
+            self._alc = bitboard.inundar_filas(self._libre, grid_w, goal)
+
+    # anillo de 8 vecinos en orden circular: lado, esquina, lado, ...
+    _ANILLO = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+    def _tramos(self, x, y):
+        """Una celda por cada grupo de lados libres de (x, y) que el anillo de 8
+        vecinos mantiene unidos; con uno solo, quitar (x, y) no separa nada."""
+        w, h, libre = self.grid_w, self.grid_h, self._libre
+        ocup = [0 <= x + dx < w and 0 <= y + dy < h and libre[y + dy] >> (x + dx) & 1
+                for dx, dy in self._ANILLO]
+        tramos = []
+        for k in (0, 2, 4, 6):
+            # un lado libre empieza tramo si no se une al lado anterior por la esquina
+            if ocup[k] and not (ocup[k - 1] and ocup[k - 2]):
+                dx, dy = self._ANILLO[k]
+                tramos.append((x + dx, y + dy))
+        return tramos
+
+    def _marcar(self, c):
+        """Marca 'c' como visitada en el bitboard y mantiene al día las alcanzables."""
+        x, y = c
+        b = 1 << x
+        self._libre[y] &= ~b
+        alc = self._alc
+        if not alc[y] & b:
+            return
+        tramos = self._tramos(x, y)
+        # corte local: se inunda a la vez desde cada lado; si dos se tocan
+        # siguen unidos, si uno se agota quedó aislado (de la meta o del resto)
+        while len(tramos) > 1:
+            i, j, zona = bitboard.separar_filas(self._libre, self.grid_w, tramos)
+            if j is not None:
+                del tramos[j]
+                continue
+            gx, gy = self.goal
+            if zona.get(gy, 0) >> gx & 1:
+                # los demás lados quedaron aislados de la meta
+                alc = self._alc = [zona.get(f, 0) for f in range(self.grid_h)]
+                break
+            for f, z in zona.items():
+                alc[f] &= ~z
+            del tramos[i]
+        alc[y] &= ~b
+
+    def _viables(self, vecs):
+        """Vecinos desde los que la meta sigue alcanzable por celdas no visitadas."""
+        alc = self._alc
+        viables = [c for c in vecs if alc[c[1]] >> c[0] & 1]
+        self.podados += len(vecs) - len(viables)
+        return viables
 
     def _candidatos(self, x, y):
         """Vecinos caminables no visitados en orden aleatorio."""
-        vecs = [(nx, ny) for (nx, ny) in _vecinos_cardinales(x, y, self.grid_w, self.grid_h)
-                if self.grid[ny][nx] in self.walkable and (nx, ny) not in self.visited]
+        if self._walk is not None:
+            walk, w = self._walk, self.grid_w
+            vecs = [(nx, ny) for (nx, ny) in _vecinos_cardinales(x, y, self.grid_w, self.grid_h)
+                    if walk[ny*w + nx] and (nx, ny) not in self.visited]
+        else:
+            vecs = [(nx, ny) for (nx, ny) in _vecinos_cardinales(x, y, self.grid_w, self.grid_h)
+                    if self.grid[ny][nx] in self.walkable and (nx, ny) not in self.visited]
+        if self.podar and vecs:
+            vecs = self._viables(vecs)
         random.shuffle(vecs)
         return vecs
 
@@ -52,31 +147,118 @@ class RandomExplorer:
         if cand:
             # avanzar a un vecino aleatorio y guardar backtracking
             self.stack.append(self.cell)
+            if len(self.stack) > self.pico_pila: self.pico_pila = len(self.stack)
             nxt = cand[0]
             self.visited.add(nxt)
+            self.visitadas += 1
+            if self.podar:
+                self._marcar(nxt)
             return nxt
         else:
             # sin vecinos nuevos: retroceder
             if self.stack:
+                self.backtracks += 1
                 return self.stack.pop()
             else:
                 # sin a dónde ir (raro porque el generador asegura camino)
                 self.finished = True
                 return self.cell
 
+    def step(self):
+        """Avanza una celda de inmediato (sin esperar a step_ms)."""
+        if self.finished:
+            return
+        nxt = self._siguiente_celda()
+        if nxt != self.cell:
+            self.steps += 1
+        self.cell = nxt
+        if self.cell == self.goal:
+            self.finished = True
+
     def update(self, dt_ms):
         if self.finished:
             return
         self._accum += dt_ms
         if self._accum >= self.step_ms:
             self._accum = 0
-            self.cell = self._siguiente_celda()
-            if self.cell == self.goal:
-                self.finished = True
+            self.step()
 
     def draw(self, surface, spr_tank, off_x, off_y, tile):
         x, y = self.cell
-        surface.blit(spr_tank, (off_x + x*tile, off_y + y*tile))
+        return surface.blit(spr_tank, (off_x + x*tile, off_y + y*tile))
+
+class CompactExplorer(RandomExplorer):
+    """
+    Mismo DFS aleatorio que RandomExplorer con estado compacto para mapas
+    enormes (1000x1000 cabe en pocos MB):
+    - visitados en un bytearray (1 byte por celda) en vez de set de tuplas;
+    - pila de índices planos en array('i') en vez de lista de tuplas;
+    - selección de vecino sin crear listas ni barajar por paso.
+    Contadores: steps, backtracks, visitadas, pico_pila.
+    """
+    def __init__(self, grid, start, goal, grid_w, grid_h, walkable: set, step_ms=160):
+        self.grid = grid
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.walkable = walkable
+        if isinstance(grid, Grid):
+            self._walk = grid.walk_bytes(walkable)
+        else:
+            self._walk = bytes(1 if c in walkable else 0 for fila in grid for c in fila)
+
+        self.cell = start
+        self.goal = goal
+        self._i = start[1]*grid_w + start[0]
+        self._goal = goal[1]*grid_w + goal[0]
+        self._visited = bytearray(grid_w * grid_h)
+        self._visited[self._i] = 1
+        self._stack = array("i")
+        self._cand = [0, 0, 0, 0]  # buffer reutilizado para los candidatos
+        self._accum = 0
+        self.step_ms = step_ms
+        self.finished = self._i == self._goal
+        self.steps = 0
+        self.backtracks = 0
+        self.visitadas = 1
+        self.pico_pila = 0
+
+    def step(self):
+        """Avanza una celda de inmediato (sin esperar a step_ms)."""
+        if self.finished:
+            return
+        i, w = self._i, self.grid_w
+        walk, vis, cand = self._walk, self._visited, self._cand
+        x = i % w
+        k = 0
+        j = i + 1
+        if x + 1 < w and walk[j] and not vis[j]: cand[k] = j; k += 1
+        j = i - 1
+        if x > 0 and walk[j] and not vis[j]: cand[k] = j; k += 1
+        j = i + w
+        if j < len(vis) and walk[j] and not vis[j]: cand[k] = j; k += 1
+        j = i - w
+        if j >= 0 and walk[j] and not vis[j]: cand[k] = j; k += 1
+
+        if k:
+            # avanzar a un vecino aleatorio y guardar backtracking
+            nxt = cand[int(random.random() * k)]
+            self._stack.append(i)
+            if len(self._stack) > self.pico_pila: self.pico_pila = len(self._stack)
+            vis[nxt] = 1
+            self.visitadas += 1
+        elif self._stack:
+            # sin vecinos nuevos: retroceder
+            nxt = self._stack.pop()
+            self.backtracks += 1
+        else:
+            self.finished = True
+            return
+
+        self._i = nxt
+        self.cell = (nxt % w, nxt // w)
+        self.steps += 1
+        if nxt == self._goal:
+            self.finished = True
 
 # ========================== A* (INFORMADO) ==========================
 def _h_manhattan(a, b):
@@ -88,7 +270,11 @@ def a_star_camino(grid, start, goal, grid_w, grid_h, walkable: set):
     """
     Devuelve la ruta óptima (lista de celdas) usando A* con heurística Manhattan.
     Si no existe camino, retorna lista vacía.
+    Acepta list[list[int]] o Grid (en ese caso busca sobre índices planos).
     """
+    if isinstance(grid, Grid):
+        return _a_star_flat(grid, start, goal, walkable)
+
     from heapq import heappush, heappop
 
     sx, sy = start; gx, gy = goal
@@ -134,40 +320,427 @@ def a_star_camino(grid, start, goal, grid_w, grid_h, walkable: set):
 
     return []  # sin ruta
 
+def _a_star_flat(grid: Grid, start, goal, walkable):
+    """A* sobre índices planos con la máscara del Grid (ruta de igual longitud que la versión por tuplas)."""
+    from heapq import heappush, heappop
+
+    w, n = grid.w, grid.w * grid.h
+    walk = grid.walk_bytes(walkable)
+    gx, gy = goal
+    s = grid.idx(*start)
+    t = grid.idx(gx, gy)
+
+    open_heap = [(0, s)]
+    g = {s: 0}
+    parent = {s: -1}
+    f_seen = {s: _h_manhattan(start, goal)}
+
+    while open_heap:
+        _, cur = heappop(open_heap)
+        if cur == t:
+            ruta = []
+            while cur != -1:
+                ruta.append((cur % w, cur // w))
+                cur = parent[cur]
+            ruta.reverse()
+            return ruta
+
+        x = cur % w
+        tentative = g[cur] + 1
+        for nb in (cur + 1 if x + 1 < w else -1, cur - 1 if x > 0 else -1, cur + w, cur - w):
+            if nb < 0 or nb >= n or not walk[nb]:
+                continue
+            if tentative < g.get(nb, tentative + 1):
+                g[nb] = tentative
+                parent[nb] = cur
+                f = tentative + abs(nb % w - gx) + abs(nb // w - gy)
+                if f < f_seen.get(nb, f + 1):
+                    f_seen[nb] = f
+                    heappush(open_heap, (f, nb))
+
+    return []  # sin ruta
+
+# ================== JUMP POINT SEARCH (INFORMADO) ===================
+def _mascara_con_borde(grid, grid_w, grid_h, walkable):
+    """
+    Máscara caminable plana con un borde de 1 celda bloqueada alrededor
+    (ancho grid_w+2): así los saltos no necesitan comprobar límites.
+    """
+    W = grid_w + 2
+    m = bytearray(W * (grid_h + 2))
+    if isinstance(grid, Grid):
+        walk = grid.walk_bytes(walkable)
+        for y in range(grid_h):
+            m[(y+1)*W + 1:(y+1)*W + 1 + grid_w] = walk[y*grid_w:(y+1)*grid_w]
+    else:
+        for y in range(grid_h):
+            m[(y+1)*W + 1:(y+1)*W + 1 + grid_w] = bytes(1 if c in walkable else 0 for c in grid[y])
+    return m
+
+def jps_camino(grid, start, goal, grid_w, grid_h, walkable: set):
+    """
+    Jump Point Search para grids 4-conexos de costo uniforme.
+    Misma firma y misma longitud de ruta que a_star_camino, pero solo mete
+    en el heap los puntos de salto (no cada celda de los pasillos rectos).
+    Devuelve la ruta completa celda a celda (apta para RouteFollower).
+    """
+    from heapq import heappush, heappop
+
+    W = grid_w + 2
+    walk = _mascara_con_borde(grid, grid_w, grid_h, walkable)
+    sx, sy = start; gx, gy = goal
+    s = (sy+1)*W + sx + 1
+    t = (gy+1)*W + gx + 1
+    walk[s] = 1  # el start (TANK_C) cuenta como caminable
+
+    # Un salto horizontal solo depende de la celda y del sentido, así que
+    # se cachea para todas las celdas recorridas: los saltos verticales
+    # consultan dos horizontales por celda y sin caché serían cuadráticos.
+    cache_h = {}
+
+    def jump_h(i, dx):
+        key = i*2 + (dx > 0)
+        if key in cache_h:
+            return cache_h[key]
+        recorridas = [key]
+        res = -1
+        while True:
+            i += dx
+            if not walk[i]:
+                break
+            # meta o vecino forzado arriba/abajo (pared a la espalda)
+            if i == t or (walk[i-W] and not walk[i-W-dx]) or (walk[i+W] and not walk[i+W-dx]):
+                res = i
+                break
+            recorridas.append(i*2 + (dx > 0))
+        for k in recorridas:
+            cache_h[k] = res
+        return res
+
+    def jump(i, d):
+        """Avanza en línea recta desde 'i' (paso 'd') hasta el siguiente punto de salto."""
+        if d == 1 or d == -1:
+            return jump_h(i, d)
+        while True:
+            i += d
+            if not walk[i]:
+                return -1
+            if i == t:
+                return i
+            if (walk[i-1] and not walk[i-1-d]) or (walk[i+1] and not walk[i+1-d]):
+                return i
+            # en vertical hay que mirar también los saltos horizontales
+            if jump_h(i, 1) != -1 or jump_h(i, -1) != -1:
+                return i
+
+    def h(i):
+        return abs(i % W - 1 - gx) + abs(i // W - 1 - gy)
+
+    todas = (1, -1, W, -W)
+    open_heap = [(h(s), s)]
+    g = {s: 0}
+    parent = {s: -1}
+    closed = set()
+
+    while open_heap:
+        _, cur = heappop(open_heap)
+        if cur in closed:
+            continue
+        if cur == t:
+            return _expandir_saltos(cur, parent, W)
+        closed.add(cur)
+
+        par = parent[cur]
+        if par == -1:
+            dirs = todas
+        elif cur // W == par // W:           # llegó en horizontal
+            dirs = (-W, W, 1 if cur > par else -1)
+        else:                                # llegó en vertical
+            dirs = (-1, 1, W if cur > par else -W)
+
+        gc = g[cur]
+        for d in dirs:
+            jp = jump(cur, d)
+            if jp == -1 or jp in closed:
+                continue
+            tentative = gc + abs(jp % W - cur % W) + abs(jp // W - cur // W)
+            if tentative < g.get(jp, tentative + 1):
+                g[jp] = tentative
+                parent[jp] = cur
+                heappush(open_heap, (tentative + h(jp), jp))
+
+    return []  # sin ruta
+
+def _expandir_saltos(node, parent, W):
+    """Reconstruye la ruta celda a celda entre puntos de salto (tramos rectos)."""
+    saltos = []
+    while node != -1:
+        saltos.append((node % W - 1, node // W - 1))
+        node = parent[node]
+    saltos.reverse()
+
+    ruta = [saltos[0]]
+    for (ax, ay), (bx, by) in zip(saltos, saltos[1:]):
+        dx = (bx > ax) - (bx < ax)
+        dy = (by > ay) - (by < ay)
+        x, y = ax, ay
+        while (x, y) != (bx, by):
+            x += dx; y += dy
+            ruta.append((x, y))
+    return ruta
+
+# ============ COSTOS DE TERRENO: DIAL (COLA DE CUBETAS) =============
+# Costo entero de ENTRAR a cada tipo de celda (1..255). La hierba es lenta.
+COSTOS_TERRENO = {EMPTY: 1, GRASS: 3, WIN_C: 1}
+
+def costos_planos(grid, walkable: set, costos=None) -> bytes:
+    """Costo de entrar a cada celda en bytes planos; 0 = no caminable."""
+    costos = COSTOS_TERRENO if costos is None else costos
+    lut = bytearray(256)
+    for code in walkable:
+        c = costos.get(code, 1)
+        if not 1 <= c <= 255:
+            raise ValueError(f"costo fuera de rango para la celda {code}: {c} (1..255)")
+        lut[code] = c
+    cells = grid.cells.tobytes() if isinstance(grid, Grid) else bytes(c for fila in grid for c in fila)
+    return cells.translate(lut)
+
+def dial_camino(grid, start, goal, grid_w, grid_h, walkable: set, costos=None):
+    """
+    Ruta de costo mínimo con costos por terreno (COSTOS_TERRENO o 'costos').
+    Misma firma y formato que a_star_camino; si no hay camino, lista vacía.
+    """
+    s = start[1]*grid_w + start[0]
+    t = goal[1]*grid_w + goal[0]
+    idxs = dial_flat(costos_planos(grid, walkable, costos), s, t, grid_w, grid_w*grid_h)
+    return [(i % grid_w, i // grid_w) for i in idxs]
+
+def dial_flat(costo, s, t, w, n, stats=None):
+    """
+    A* con cola de cubetas (Dial) sobre costos enteros pequeños: f es entero
+    y, con h = Manhattan * costo mínimo (consistente), al expandir un nodo
+    sus hijos caen a lo sumo cmax + cmin cubetas más adelante, así que
+    basta un anillo de ese tamaño. push/pop son append/pop de listas de
+    enteros (sin tuplas ni heap). Las entradas viejas se descartan al sacarlas.
+    Trabaja sobre índices planos ('costo' como el de costos_planos) y
+    devuelve la lista de índices; lo usan dial_camino y la estrategia 'dial'
+    de search.py. 'stats' (search.SearchStats) es opcional.
+    """
+    if s == t:
+        return [s]
+    usados = set(costo) - {0}
+    if not costo[t] or not usados:
+        return []
+    cmin, cmax = min(usados), max(usados)
+    gx, gy = t % w, t // w
+    anillo = cmax + cmin + 1
+    cubetas = [[] for _ in range(anillo)]
+    INF = 1 << 30
+    g = array("i", [INF]) * n
+    parent = array("i", [-1]) * n
+
+    g[s] = 0
+    f = cmin * (abs(s % w - gx) + abs(s // w - gy))
+    cubetas[f % anillo].append(s)
+    pendientes = pushes = 1
+    expandidos = pico = 0
+    while pendientes:
+        cubeta = cubetas[f % anillo]
+        while cubeta:       # los hijos con el mismo f se agregan a esta misma cubeta
+            if pendientes > pico: pico = pendientes
+            cur = cubeta.pop()
+            pendientes -= 1
+            x, y = cur % w, cur // w
+            gc = g[cur]
+            if gc + cmin * (abs(x - gx) + abs(y - gy)) != f:
+                continue    # entrada vieja (se mejoró su g después)
+            expandidos += 1
+            if cur == t:
+                ruta = []
+                while cur != -1:
+                    ruta.append(cur)
+                    cur = parent[cur]
+                ruta.reverse()
+                if stats is not None:
+                    stats.expandidos, stats.pushes, stats.pico_frontera = expandidos, pushes, pico
+                return ruta
+            for nb in (cur + 1 if x + 1 < w else -1, cur - 1 if x > 0 else -1, cur + w, cur - w):
+                if nb < 0 or nb >= n:
+                    continue
+                c = costo[nb]
+                if not c:
+                    continue
+                ng = gc + c
+                if ng < g[nb]:
+                    g[nb] = ng
+                    parent[nb] = cur
+                    cubetas[(ng + cmin * (abs(nb % w - gx) + abs(nb // w - gy))) % anillo].append(nb)
+                    pendientes += 1
+                    pushes += 1
+        f += 1
+
+    if stats is not None:
+        stats.expandidos, stats.pushes, stats.pico_frontera = expandidos, pushes, pico
+    return []
+
+def costo_ruta(grid, ruta, costos=None):
+    """Suma del costo de terreno de la ruta (sin contar la celda inicial)."""
+    costos = COSTOS_TERRENO if costos is None else costos
+    return sum(costos.get(int(grid[y][x]), 1) for x, y in ruta[1:])
+
+def tiempo_terreno(grid, costos=None):
+    """Para RouteFollower(tiempo_celda=...): pasos necesarios para entrar a cada celda."""
+    costos = COSTOS_TERRENO if costos is None else costos
+    return lambda cell: costos.get(int(grid[cell[1]][cell[0]]), 1)
+
+# ===================== CACHÉ DE RUTAS (LRU) =========================
+def _hash_grid(grid):
+    """Hash barato del contenido: el de Grid se memoriza por versión; una
+    lista de listas se hashea en cada consulta."""
+    if isinstance(grid, Grid):
+        return grid.content_hash()
+    h = hashlib.blake2b(digest_size=16)
+    for fila in grid:
+        h.update(bytes(fila))
+        h.update(b"|")
+    return h.digest()
+
+class PathCache:
+    """
+    Memoriza rutas por (hash del grid, start, goal, walkable, planificador).
+    - LRU acotada a 'maxsize' entradas.
+    - hits / misses para medir su efecto.
+    Si el grid cambia (Grid.set incrementa 'version'), su hash cambia y la
+    consulta ya no coincide con rutas viejas: no hace falta invalidar a mano.
+    Se puede usar desde varios hilos (prefetch.py planifica en otro): un
+    lock protege la LRU; el planificador corre fuera del lock.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._rutas = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def buscar(self, grid, start, goal, grid_w, grid_h, walkable: set, planner=None):
+        planner = planner or a_star_camino
+        key = (_hash_grid(grid), start, goal, frozenset(walkable), planner.__name__)
+        with self._lock:
+            res = self._rutas.get(key)
+            if res is not None:
+                self._rutas.move_to_end(key)
+                self.hits += 1
+                return self._copia(res)
+            self.misses += 1
+
+        res = planner(grid, start, goal, grid_w, grid_h, walkable)
+        with self._lock:
+            self._rutas[key] = self._copia(res)
+            if len(self._rutas) > self.maxsize:
+                self._rutas.popitem(last=False)
+        return res
+
+    @staticmethod
+    def _copia(res):
+        """Copia la ruta para que quien la recibe no altere la guardada.
+        Los planificadores de search.py devuelven (ruta, stats): se copia la ruta."""
+        if isinstance(res, tuple):
+            return (list(res[0]),) + res[1:]
+        return list(res)
+
+    def clear(self):
+        with self._lock:
+            self._rutas.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._rutas)
+
+RUTAS_CACHE = PathCache()
+
 # ===================== SEGUIDOR DE RUTA (ANIMACIÓN) =================
 class RouteFollower:
     """
     Anima al tanque siguiendo una ruta (lista de celdas) calculada (p. ej., A*).
+    Con 'planner' (p. ej. replan.DStarLite) cambia el tramo restante de la
+    ruta cada vez que el planificador reporta un cambio del mapa.
+    Con 'tiempo_celda' (p. ej. tiempo_terreno(grid)) entrar a una celda
+    lleva tiempo_celda(celda) pasos en lugar de 1 (la hierba es más lenta).
     """
-    def __init__(self, ruta, step_ms=160):
+    def __init__(self, ruta, step_ms=160, planner=None, tiempo_celda=None):
         self.ruta = ruta or []
         self.i = 0
         self.cell = self.ruta[0] if self.ruta else None
         self._accum = 0
         self.step_ms = step_ms
         self.finished = False if self.ruta else True
+        self.planner = planner
+        self._plan_version = planner.version if planner else 0
+        self.tiempo_celda = tiempo_celda
+        self._espera = 0           # pasos acumulados para entrar a la próxima celda
 
-    def reset(self, ruta):
+    def reset(self, ruta, planner=None, tiempo_celda=None):
         self.ruta = ruta or []
         self.i = 0
         self.cell = self.ruta[0] if self.ruta else None
         self._accum = 0
         self.finished = False if self.ruta else True
+        self.planner = planner
+        self._plan_version = planner.version if planner else 0
+        self.tiempo_celda = tiempo_celda
+        self._espera = 0
+
+    def cambiar_ruta(self, resto):
+        """Sustituye lo que queda de ruta por 'resto' (que empieza en la celda actual).
+        La celda actual sigue en ruta[i] aunque 'resto' venga vacío (sin camino);
+        con un resto no vacío vuelve a seguir la ruta aunque ya hubiera terminado."""
+        resto = list(resto)
+        if self.cell is not None and (not resto or resto[0] != self.cell):
+            resto.insert(0, self.cell)
+        self.ruta = self.ruta[:self.i] + resto
+        self.finished = len(resto) <= 1
+
+    @property
+    def detenido(self) -> bool:
+        """Terminó y el planificador no tiene cambios pendientes (nada que hacer en step)."""
+        return self.finished and (self.planner is None or self.planner.version == self._plan_version)
+
+    def _sincronizar(self):
+        """Si el planificador cambió de versión, toma su ruta desde la celda actual."""
+        if self.planner is not None and self.planner.version != self._plan_version:
+            self._plan_version = self.planner.version
+            self.planner.move_to(self.cell)
+            self.cambiar_ruta(self.planner.path())
+
+    def step(self):
+        """Avanza una celda de la ruta de inmediato (sin esperar a step_ms)."""
+        self._sincronizar()
+        if self.finished or not self.ruta:
+            return
+        if self.i < len(self.ruta) - 1:
+            if self.tiempo_celda is not None:
+                self._espera += 1
+                if self._espera < self.tiempo_celda(self.ruta[self.i + 1]):
+                    return
+                self._espera = 0
+            self.i += 1
+            self.cell = self.ruta[self.i]
+            if self.planner is not None:
+                self.planner.move_to(self.cell)
+        if self.i >= len(self.ruta) - 1:
+            self.finished = True
 
     def update(self, dt_ms):
+        self._sincronizar()
         if self.finished or not self.ruta:
             return
         self._accum += dt_ms
         if self._accum >= self.step_ms:
             self._accum = 0
-            if self.i < len(self.ruta) - 1:
-                self.i += 1
-                self.cell = self.ruta[self.i]
-            if self.i >= len(self.ruta) - 1:
-                self.finished = True
+            self.step()
 
     def draw(self, surface, spr_tank, off_x, off_y, tile):
         if self.cell is None:
             return
         x, y = self.cell
-        surface.blit(spr_tank, (off_x + x*tile, off_y + y*tile))
+        return surface.blit(spr_tank, (off_x + x*tile, off_y + y*tile))
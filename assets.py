@@ -0,0 +1,71 @@
+# assets.py
+# Caché en disco de imágenes ya reescaladas: decodificar brick.png/grass.png
+# (1.5 MB c/u) y bg.jpg y pasarlos por smoothscale en cada arranque es lo
+# que más tarda antes de mostrar el menú. La primera vez se guardan los
+# píxeles escalados en crudo; las siguientes se cargan con frombytes.
+import hashlib
+import os
+
+import pygame
+
+CACHE_DIR = os.environ.get(
+    "TANK_ASSET_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".asset_cache"))
+
+def _escalar(img, w, h, modo):
+    if modo == "smooth":
+        return pygame.transform.smoothscale(img, (w, h))
+    if modo == "fast":
+        return pygame.transform.scale(img, (w, h))
+    raise ValueError(f"modo de escalado desconocido: {modo!r}")
+
+def _ruta_cache(path, w, h, modo, fmt):
+    """Nombre del archivo en caché: la clave incluye ruta, mtime, tamaño destino y modo."""
+    src = os.path.abspath(path)
+    st = os.stat(src)
+    clave = f"{src}|{st.st_mtime_ns}|{st.st_size}|{w}x{h}|{modo}|{fmt}"
+    digest = hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+    prefijo = f"{os.path.basename(path)}-{w}x{h}-{modo}-{fmt}-"
+    return os.path.join(CACHE_DIR, prefijo + digest + ".raw"), prefijo
+
+def _guardar(destino, prefijo, surf, fmt):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # borrar versiones viejas de la misma imagen/tamaño (fuente modificada)
+    for nombre in os.listdir(CACHE_DIR):
+        if nombre.startswith(prefijo):
+            try: os.remove(os.path.join(CACHE_DIR, nombre))
+            except OSError: pass
+    tmp = destino + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(pygame.image.tobytes(surf, fmt))
+    os.replace(tmp, destino)  # escritura atómica: nunca queda un .raw a medias
+
+def cargar_escalado(path, w, h, alpha=True, modo="smooth"):
+    """
+    Carga 'path' reescalado a (w, h) usando la caché en disco si está al día.
+    alpha=True -> RGBA + convert_alpha(); alpha=False -> RGB + convert().
+    Si la caché no existe, está vieja o no se puede escribir, regenera.
+    """
+    fmt = "RGBA" if alpha else "RGB"
+    destino, prefijo = _ruta_cache(path, w, h, modo, fmt)
+
+    surf = None
+    try:
+        with open(destino, "rb") as f:
+            data = f.read()
+        if len(data) == w * h * len(fmt):
+            surf = pygame.image.frombytes(data, (w, h), fmt)
+    except OSError:
+        pass
+
+    if surf is None:
+        img = pygame.image.load(path)
+        img = img.convert_alpha() if alpha else img.convert()
+        surf = _escalar(img, w, h, modo)
+        try:
+            _guardar(destino, prefijo, surf, fmt)
+        except OSError:
+            pass  # sin caché (p. ej. disco de solo lectura): se usa igual
+        return surf
+
+    return surf.convert_alpha() if alpha else surf.convert()
@@ -0,0 +1,243 @@
+# batchenv.py
+# Entorno por lotes: N niveles independientes apilados en arrays NumPy y un
+# paso vectorizado que mueve a todos los agentes a la vez (DFS aleatorio o
+# seguimiento de la ruta óptima), con API estilo gym: reset() / step().
+# Reemplaza el bucle "un objeto RandomExplorer por nivel" de sim.py cuando
+# hay que evaluar millones de episodios.
+#
+# Uso:
+#   python batchenv.py --entornos 4096 --pasos 2000 --politica dfs
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # word importa pygame (no abre ventana)
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+import word
+
+POLITICAS = ("dfs", "ruta")
+# acciones externas: 0:+x 1:-x 2:+y 3:-y (mismo orden que flowfield.FlowField.dirs)
+
+class BatchEnv:
+    """
+    N entornos de grid_w x grid_h. Las celdas se guardan planas con un borde
+    de 1 celda bloqueada (ancho grid_w+2): los vecinos no necesitan límites.
+    - reset() -> obs; step(acciones=None) -> (obs, reward, done, info).
+    - obs: (N, 2) int32 con la celda (x, y) de cada agente.
+    - acciones None: política interna ('dfs' = mismo DFS aleatorio con
+      backtracking que RandomExplorer; 'ruta' = bajar por la distancia a la
+      meta, una ruta óptima). Si no, (N,) en 0..3; contra un muro no se mueve.
+    - reward: 1.0 el paso en que el agente llega a la meta, 0.0 si no.
+    - done: episodio terminado en este paso (meta, sin salida o max_pasos).
+      max_pasos cuenta los step() del episodio, se haya movido o no el agente.
+      Con autoreset esos entornos cargan un nivel nuevo en el mismo step
+      (obs ya es del nivel nuevo) e 'info' trae los datos del episodio:
+      reached, steps (movimientos), transcurridos (step() del episodio),
+      backtracks y terminados (índices de los entornos).
+    - pack: levels.LevelPack opcional; si se da, los niveles salen de ahí
+      (al azar) en vez de generarse, lo que abarata mucho el reset.
+    """
+    def __init__(self, n: int, grid_w: int = 22, grid_h: int = 12, politica: str = "dfs",
+                 densidad_brick: float = 0.30, densidad_grass: float = 0.15,
+                 max_pasos=None, autoreset: bool = True, seed=None,
+                 metodo: str = "conexo", pack=None):
+        if politica not in POLITICAS:
+            raise ValueError(f"política desconocida: {politica!r} (usa una de {POLITICAS})")
+        self.n = n
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.politica = politica
+        self.densidad_brick = densidad_brick
+        self.densidad_grass = densidad_grass
+        self.max_pasos = max_pasos
+        self.autoreset = autoreset
+        self.metodo = metodo
+        self.pack = pack
+        self.rng = np.random.default_rng(seed)
+
+        W = self._W = grid_w + 2
+        P = W * (grid_h + 2)
+        self._off = np.array((1, -1, W, -W), dtype=np.int64)
+        self._filas = np.arange(n)
+        self.walk = np.zeros((n, P), dtype=bool)
+        self.visited = np.zeros((n, P), dtype=bool)
+        self.stack = np.zeros((n, P), dtype=np.int32)    # pila DFS (celdas previas)
+        self.sp = np.zeros(n, dtype=np.int64)
+        self.dist = np.full((n, P), -1, dtype=np.int32) if politica == "ruta" else None
+        self.pos = np.zeros(n, dtype=np.int64)
+        self.goal = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)          # movimientos
+        self.transcurridos = np.zeros(n, dtype=np.int64)  # step() del episodio (límite)
+        self.backtracks = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.episodios = 0         # episodios terminados (total)
+        self.resueltos = 0         # de ellos, los que llegaron a la meta
+
+    # ---------------- niveles ----------------
+    def _nivel(self):
+        if self.pack is not None:
+            grid, start, goal, _ = self.pack[int(self.rng.integers(len(self.pack)))]
+            return grid, start, goal
+        random.seed(int(self.rng.integers(1 << 62)))
+        return word.generar_nivel(
+            self.grid_w, self.grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+            densidad_brick=self.densidad_brick, densidad_grass=self.densidad_grass,
+            como_grid=True, metodo=self.metodo)
+
+    def _cargar(self, idx):
+        """Pone niveles nuevos en los entornos 'idx' y reinicia su estado."""
+        W = self._W
+        for i in idx:
+            grid, start, goal = self._nivel()
+            m = self.walk[i].reshape(self.grid_h + 2, W)
+            m[1:-1, 1:-1] = grid.mask
+            s = (start[1] + 1)*W + start[0] + 1
+            m.flat[s] = True               # el tanque (TANK_C) está sobre su propia celda
+            self.pos[i] = s
+            self.goal[i] = (goal[1] + 1)*W + goal[0] + 1
+        self.visited[idx] = False
+        self.visited[idx, self.pos[idx]] = True
+        self.sp[idx] = 0
+        self.steps[idx] = 0
+        self.transcurridos[idx] = 0
+        self.backtracks[idx] = 0
+        self.done[idx] = False
+        if self.dist is not None:
+            self._distancias(idx)
+
+    def _distancias(self, idx):
+        """BFS inversa desde la meta de todos los entornos 'idx' a la vez (frente de onda)."""
+        walk = self.walk[idx]
+        dist = np.full(walk.shape, -1, dtype=np.int32)
+        filas = np.arange(len(idx))
+        dist[filas, self.goal[idx]] = 0
+        frente = np.zeros_like(walk)
+        frente[filas, self.goal[idx]] = True
+        d = 0
+        while frente.any():
+            d += 1
+            nuevo = np.zeros_like(frente)
+            for o in (1, self._W):         # el borde bloqueado evita salirse por los lados
+                nuevo[:, o:] |= frente[:, :-o]
+                nuevo[:, :-o] |= frente[:, o:]
+            nuevo &= walk
+            nuevo &= dist < 0
+            dist[nuevo] = d
+            frente = nuevo
+        self.dist[idx] = dist
+
+    # ---------------- API gym ----------------
+    def obs(self):
+        W = self._W
+        return np.stack((self.pos % W - 1, self.pos // W - 1), axis=1).astype(np.int32)
+
+    def reset(self):
+        """Carga N niveles nuevos. Devuelve obs."""
+        self._cargar(self._filas)
+        return self.obs()
+
+    def step(self, acciones=None):
+        vivos = self._filas if self.autoreset else np.flatnonzero(~self.done)
+        pos = self.pos[vivos]
+        nb = pos[:, None] + self._off                      # (k, 4)
+        filas = vivos[:, None]
+        k = np.arange(len(vivos))
+        atascado = np.zeros(len(vivos), dtype=bool)
+
+        if acciones is not None:
+            acciones = np.asarray(acciones)[vivos]
+            nxt = nb[k, acciones]
+            ok = self.walk[vivos, nxt]
+            nxt = np.where(ok, nxt, pos)
+            self.visited[vivos, nxt] = True
+            movido = ok
+        elif self.politica == "dfs":
+            cand = self.walk[filas, nb] & ~self.visited[filas, nb]
+            hay = cand.any(axis=1)
+            r = self.rng.random(cand.shape)
+            r[~cand] = -1.0
+            nxt = nb[k, r.argmax(axis=1)]                  # vecino nuevo al azar (uniforme)
+            sp = self.sp[vivos]
+            # avanzar: apilar la celda actual
+            a = vivos[hay]
+            self.stack[a, sp[hay]] = pos[hay]
+            self.sp[a] += 1
+            self.visited[a, nxt[hay]] = True
+            # sin vecinos nuevos: retroceder
+            atras = ~hay & (sp > 0)
+            b = vivos[atras]
+            self.sp[b] -= 1
+            nxt[atras] = self.stack[b, self.sp[b]]
+            self.backtracks[b] += 1
+            atascado = ~hay & (sp == 0)
+            nxt[atascado] = pos[atascado]
+            movido = ~atascado
+        else:  # "ruta": vecino con distancia d-1 a la meta
+            d = self.dist[filas, nb]
+            d = np.where(d < 0, np.iinfo(np.int32).max, d)
+            nxt = nb[k, d.argmin(axis=1)]
+            atascado = self.dist[vivos, pos] < 0
+            nxt[atascado] = pos[atascado]
+            movido = ~atascado & (pos != self.goal[vivos])
+
+        self.pos[vivos] = nxt
+        self.steps[vivos] += movido
+        self.transcurridos[vivos] += 1
+
+        llego = np.zeros(self.n, dtype=bool)
+        llego[vivos] = nxt == self.goal[vivos]
+        fin = np.zeros(self.n, dtype=bool)
+        fin[vivos] = llego[vivos] | atascado
+        if self.max_pasos is not None:
+            fin[vivos] |= self.transcurridos[vivos] >= self.max_pasos
+        fin &= ~self.done
+
+        terminados = np.flatnonzero(fin)
+        info = {"reached": llego[terminados], "steps": self.steps[terminados].copy(),
+                "transcurridos": self.transcurridos[terminados].copy(),
+                "backtracks": self.backtracks[terminados].copy(), "terminados": terminados}
+        self.episodios += len(terminados)
+        self.resueltos += int(llego[terminados].sum())
+        self.done |= fin
+        if self.autoreset and len(terminados):
+            self._cargar(terminados)
+        return self.obs(), llego.astype(np.float32), fin, info
+
+# ---------------------------- CLI ----------------------------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Mide el entorno por lotes de Tank 1990.")
+    p.add_argument("--entornos", type=int, default=4096)
+    p.add_argument("--pasos", type=int, default=2000)
+    p.add_argument("--politica", choices=POLITICAS, default="dfs")
+    p.add_argument("--ancho", type=int, default=22)
+    p.add_argument("--alto", type=int, default=12)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--pack", default=None, help="pack de niveles (levels.py) en vez de generarlos")
+    a = p.parse_args(argv)
+
+    pack = None
+    if a.pack:
+        from levels import LevelPack
+        pack = LevelPack(a.pack)
+    env = BatchEnv(a.entornos, a.ancho, a.alto, a.politica, seed=a.seed, pack=pack)
+    env.reset()
+    pasos_ep = 0
+    t0 = time.perf_counter()
+    for _ in range(a.pasos):
+        _, _, _, info = env.step()
+        pasos_ep += int(info["steps"].sum())
+    dt = time.perf_counter() - t0
+
+    print(f"episodios: {env.episodios} (resueltos {env.resueltos})")
+    print(f"pasos medio por episodio: {pasos_ep / max(1, env.episodios):.2f}")
+    print(f"{a.entornos * a.pasos / dt:,.0f} pasos-agente/s, {env.episodios / dt:,.0f} episodios/s")
+    if pack is not None:
+        pack.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
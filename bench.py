@@ -0,0 +1,217 @@
+# bench.py
+# Benchmarks de escalado: generación, validación, búsqueda, exploración y
+# dibujo del mapa (completo y por cámara) y el paso del modo COMPETITIVE sobre
+# distintos tamaños de grid y densidades.
+# El dibujo corre con el driver de video "dummy" de SDL (sin ventana).
+#
+# Uso:
+#   python bench.py --json bench.json
+#   python bench.py --baseline bench.json --tolerancia 0.25   # detecta regresiones
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import functools
+import json
+import random
+import statistics
+import sys
+import time
+
+import pygame
+
+from agent import RandomExplorer, CompactExplorer, a_star_camino, jps_camino
+from camera import Camera, ChunkedMapLayer
+from competitive import Arena
+from grid import Grid
+from hpa import HPAStar
+import word
+
+TAMANOS = ((22, 12), (64, 64), (256, 256), (1024, 1024))
+DENSIDADES = ((0.10, 0.10), (0.30, 0.15), (0.45, 0.15))
+MAX_CELDAS_RECHAZO = 256 * 256   # el método por rechazo no termina a tiempo más allá
+PASOS_EXPLORER = 2000
+TANQUES_ARENA = 120
+VISTA = (1856, 830)               # área de mapa en pantalla (main.VISTA_MAX)
+
+# ---------------------- medición ----------------------
+def medir(fn, min_s: float = 0.2, max_reps: int = 50):
+    """Ejecuta fn() hasta acumular 'min_s' segundos (mínimo 1 vez).
+    Devuelve (reps, mediana_ns, min_ns)."""
+    tiempos = []
+    total = 0
+    while len(tiempos) < max_reps and (not tiempos or total < min_s * 1e9):
+        t0 = time.perf_counter_ns()
+        fn()
+        dt = time.perf_counter_ns() - t0
+        tiempos.append(dt)
+        total += dt
+    return len(tiempos), int(statistics.median(tiempos)), min(tiempos)
+
+def _nivel(w, h, db, dg, seed):
+    random.seed(seed)
+    return word.generar_nivel(w, h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+                              densidad_brick=db, densidad_grass=dg,
+                              como_grid=True, metodo="conexo")
+
+def _sprites(tile):
+    sprites = []
+    for color in ((40, 140, 40), (150, 70, 30), (230, 200, 40)):
+        s = pygame.Surface((tile, tile)); s.fill(color); sprites.append(s)
+    return sprites
+
+def _superficie_dibujo(w, h):
+    """Tile reducido para que la superficie no pase de ~2048 px por lado."""
+    tile = max(1, min(64, 2048 // max(w, h)))
+    return pygame.Surface((w * tile, h * tile)), tile, _sprites(tile)
+
+# ---------------------- casos ----------------------
+def casos(w, h, db, dg, seed, min_s):
+    """Genera (nombre, reps, mediana_ns, min_ns) para un tamaño y densidad."""
+    gen = lambda metodo: word.generar_nivel(
+        w, h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+        densidad_brick=db, densidad_grass=dg, como_grid=True, metodo=metodo)
+
+    random.seed(seed)
+    yield ("generar_nivel[conexo]",) + medir(lambda: gen("conexo"), min_s)
+    if w * h <= MAX_CELDAS_RECHAZO:
+        random.seed(seed)
+        yield ("generar_nivel[rechazo]",) + medir(lambda: gen("rechazo"), min_s)
+
+    grid, start, goal = _nivel(w, h, db, dg, seed)
+    walk = word.WALKABLE
+    yield ("_hay_camino_bfs",) + medir(
+        lambda: word._hay_camino_bfs(grid, start, goal, w, h, walk), min_s)
+    yield ("_hay_camino[bitboard]",) + medir(
+        lambda: word._hay_camino(grid, start, goal, w, h, walk), min_s)
+    yield ("a_star_camino",) + medir(
+        lambda: a_star_camino(grid, start, goal, w, h, walk), min_s)
+    yield ("jps_camino",) + medir(
+        lambda: jps_camino(grid, start, goal, w, h, walk), min_s)
+    # HPA*: la abstracción se construye una vez por nivel; la consulta se repite
+    yield ("HPAStar[build]",) + medir(lambda: HPAStar(grid, w, h, walk), min_s)
+    hpa = HPAStar(grid, w, h, walk)
+    yield ("HPAStar.ruta",) + medir(lambda: hpa.ruta(start, goal), min_s)
+
+    # costo por paso de los exploradores (ns/paso sobre PASOS_EXPLORER pasos);
+    # [podar] no debe crecer con el mapa: ~30 us/paso tanto a 22x12 como a
+    # 1024x1024 (con el bitboard de un solo int eran ~40 ms a 1024x1024)
+    for nombre, cls in (("RandomExplorer", RandomExplorer), ("CompactExplorer", CompactExplorer),
+                        ("RandomExplorer[podar]", functools.partial(RandomExplorer, podar=True))):
+        def explorar(cls=cls):
+            random.seed(seed)
+            ex = cls(grid, start, goal, w, h, walk)
+            for _ in range(PASOS_EXPLORER):
+                if ex.finished: break
+                ex.step()
+            return max(1, ex.steps)
+        pasos = explorar()
+        reps, med, mn = medir(explorar, min_s)
+        yield (f"{nombre}.step", reps, med // pasos, mn // pasos)
+
+    surf, tile, (spr_grass, spr_brick, spr_win) = _superficie_dibujo(w, h)
+    yield ("dibujar_grid",) + medir(
+        lambda: word.dibujar_grid(surf, grid, w, h, tile, (22, 22, 22),
+                                  spr_grass, spr_brick, spr_win, 0, 0), min_s)
+
+    # cámara a tile 64: recorre el mapa de a una celda (chunks calientes y fríos)
+    pantalla = pygame.Surface(VISTA)
+    cam = Camera(pantalla.get_rect(), w, h, 64)
+    cam.centrar(start)
+    capa = ChunkedMapLayer(grid, w, h, 64, (22, 22, 22), *_sprites(64))
+    def dibujar_vista():
+        if not cam.desplazar(64, 0):
+            cam.x = 0
+        capa.draw(pantalla, cam)
+    yield ("ChunkedMapLayer.draw",) + medir(dibujar_vista, min_s)
+
+    # COMPETITIVE: un paso de 16 ms con TANQUES_ARENA tanques (rompe ladrillos: copia del grid)
+    arena = Arena(Grid(grid.cells.copy()), w, h, 64, TANQUES_ARENA, rng=random.Random(seed))
+    yield (f"Arena.step[{TANQUES_ARENA}]",) + medir(lambda: arena.step(0.016), min_s)
+
+def correr(tamanos=TAMANOS, densidades=DENSIDADES, seed=0, min_s=0.2, log=None):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    resultados = []
+    for w, h in tamanos:
+        for db, dg in densidades:
+            for nombre, reps, med, mn in casos(w, h, db, dg, seed, min_s):
+                r = {"bench": nombre, "w": w, "h": h,
+                     "densidad_brick": db, "densidad_grass": dg,
+                     "reps": reps, "median_ns": med, "min_ns": mn}
+                resultados.append(r)
+                if log: log(r)
+    return resultados
+
+# ---------------------- baseline ----------------------
+def _clave(r):
+    return (r["bench"], r["w"], r["h"], r["densidad_brick"], r["densidad_grass"])
+
+def comparar(resultados, baseline, tolerancia: float = 0.25):
+    """Lista de (resultado, base, ratio) cuya mediana empeoró más de 'tolerancia'."""
+    base = {_clave(r): r for r in baseline}
+    regresiones = []
+    for r in resultados:
+        b = base.get(_clave(r))
+        if b and b["median_ns"] > 0:
+            ratio = r["median_ns"] / b["median_ns"]
+            if ratio > 1 + tolerancia:
+                regresiones.append((r, b, ratio))
+    return regresiones
+
+# ---------------------------- CLI ----------------------------
+def _parse_tamanos(s):
+    return tuple(tuple(int(v) for v in t.lower().split("x")) for t in s.split(","))
+
+def _parse_densidades(s):
+    return tuple(tuple(float(v) for v in t.split(":")) for t in s.split(","))
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmarks de escalado de Tank 1990.")
+    p.add_argument("--tamanos", type=_parse_tamanos, default=TAMANOS,
+                   help="p. ej. 22x12,256x256,1024x1024")
+    p.add_argument("--densidades", type=_parse_densidades, default=DENSIDADES,
+                   help="brick:grass separados por coma, p. ej. 0.3:0.15,0.45:0.1")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--min-s", type=float, default=0.2, help="tiempo mínimo por caso")
+    p.add_argument("--json", default=None, help="guardar resultados en JSON")
+    p.add_argument("--csv", default=None, help="guardar resultados en CSV")
+    p.add_argument("--baseline", default=None, help="JSON previo con el que comparar")
+    p.add_argument("--tolerancia", type=float, default=0.25)
+    a = p.parse_args(argv)
+
+    def log(r):
+        print(f"{r['bench']:<28} {r['w']:>5}x{r['h']:<5} b={r['densidad_brick']:.2f} "
+              f"g={r['densidad_grass']:.2f}  {r['median_ns']/1e6:10.3f} ms  (n={r['reps']})")
+
+    word.GEN_STATS.reset()
+    res = correr(a.tamanos, a.densidades, a.seed, a.min_s, log)
+    g = word.GEN_STATS.as_dict()
+    print(f"generación: {g['niveles']} niveles, {g['intentos']} intentos, "
+          f"aceptación {g['tasa_aceptacion']:.2f}, {g['ms_por_nivel']:.3f} ms/nivel")
+
+    if a.json:
+        with open(a.json, "w") as f:
+            json.dump(res, f, indent=1)
+    if a.csv:
+        with open(a.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(res[0].keys()))
+            w.writeheader()
+            w.writerows(res)
+
+    if a.baseline:
+        with open(a.baseline) as f:
+            regresiones = comparar(res, json.load(f), a.tolerancia)
+        for r, b, ratio in regresiones:
+            print(f"REGRESIÓN {r['bench']} {r['w']}x{r['h']} b={r['densidad_brick']} "
+                  f"g={r['densidad_grass']}: {b['median_ns']/1e6:.3f} -> "
+                  f"{r['median_ns']/1e6:.3f} ms (x{ratio:.2f})")
+        if regresiones:
+            return 1
+        print("sin regresiones respecto a", a.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# bitboard.py
+# Alcanzabilidad por bitboards: las celdas caminables son bits de un int de
+# Python y la inundación avanza por corridas completas con "occluded fill"
+# (Kogge-Stone: desplazar y enmascarar con pasos 1, 2, 4...), alternando
+# horizontal y vertical hasta un punto fijo. Son unas decenas de operaciones
+# sobre ints grandes por vuelta en vez de una visita por celda.
+# - Tablero: todo el grid en un solo int (filas de w+1 bits; la columna de
+#   relleno en 0 impide que un desplazamiento pase de una fila a la otra).
+# - inundar_filas: un int por fila y solo se reprocesan las filas que
+#   recibieron bits nuevos; en grids grandes rinde mucho más que el int único.
+# - separar_filas: varias inundaciones a la vez para saber si quitar una celda
+#   partió la zona libre, sin recorrer más que el lado chico.
+from collections import deque
+
+import numpy as np
+
+LIMITE_GLOBAL = 128 * 128   # celdas: hasta aquí conviene el int único (Tablero)
+
+def _pasos(n: int, paso: int = 1):
+    """Desplazamientos paso, 2*paso, 4*paso... que cubren una corrida de 'n' celdas."""
+    out, k = [], 1
+    while k < n:
+        out.append(paso * k)
+        k *= 2
+    return out
+
+def _llenar(g: int, libre: int, pasos) -> int:
+    """Extiende 'g' por las corridas de 'libre' en los dos sentidos de un eje."""
+    a, p = g, libre
+    for s in pasos:
+        a |= p & (a << s)
+        p &= p << s
+    b, p = g, libre
+    for s in pasos:
+        b |= p & (b >> s)
+        p &= p >> s
+    return a | b
+
+# ------------------------ int único ------------------------
+class Tablero:
+    """
+    Geometría de un grid w x h como bits: bit(x, y) = 1 << (y*(w+1) + x).
+    - desde_mascara(mask) / a_mascara(bits): conversión con máscaras bool (h, w).
+    - inundar(semilla, libre, objetivo=0): celdas de 'libre' conectadas a
+      'semilla' (que se da por libre); corta en cuanto cubre todos los bits
+      de 'objetivo' (si no, sigue hasta el punto fijo).
+    """
+    def __init__(self, w: int, h: int):
+        self.w = w
+        self.h = h
+        self.W = w + 1
+        self._pasos_h = _pasos(w)
+        self._pasos_v = _pasos(h, self.W)
+
+    def bit(self, x: int, y: int) -> int:
+        return 1 << (y*self.W + x)
+
+    def desde_mascara(self, mask) -> int:
+        pad = np.zeros((self.h, self.W), dtype=bool)
+        pad[:, :self.w] = mask
+        return int.from_bytes(np.packbits(pad, bitorder="little").tobytes(), "little")
+
+    def a_mascara(self, bits: int):
+        n = self.h * self.W
+        b = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+        m = np.unpackbits(b, count=n, bitorder="little").astype(bool)
+        return m.reshape(self.h, self.W)[:, :self.w]
+
+    def inundar(self, semilla: int, libre: int, objetivo: int = 0) -> int:
+        libre |= semilla
+        r = semilla
+        while True:
+            previo = r
+            r = _llenar(r, libre, self._pasos_h)
+            r = _llenar(r, libre, self._pasos_v)
+            if r == previo or (objetivo and r & objetivo == objetivo):
+                return r
+
+# ------------------------ un int por fila ------------------------
+def filas_desde_mascara(mask):
+    """Lista de h ints: bit x de la fila y = mask[y, x]."""
+    b = np.packbits(mask, axis=1, bitorder="little")
+    return [int.from_bytes(f.tobytes(), "little") for f in b]
+
+def filas_a_mascara(filas, w: int):
+    nb = (w + 7) // 8
+    b = np.frombuffer(b"".join(f.to_bytes(nb, "little") for f in filas), dtype=np.uint8)
+    return np.unpackbits(b.reshape(len(filas), nb), axis=1, count=w, bitorder="little").astype(bool)
+
+def inundar_filas(libres, w: int, start, goal=None, objetivos=()):
+    """
+    Inundación desde 'start' sobre los ints por fila 'libres' (start cuenta
+    como libre). Devuelve la lista de filas alcanzadas; si se da 'goal' (o
+    varias celdas en 'objetivos'), corta en cuanto las alcanza todas (el
+    resultado queda parcial).
+    """
+    h = len(libres)
+    pasos = _pasos(w)
+    sx, sy = start
+    libres = list(libres)
+    libres[sy] |= 1 << sx
+    alc = [0] * h
+    alc[sy] = 1 << sx
+    pendientes = [sy]
+    en_cola = bytearray(h)
+    en_cola[sy] = 1
+    faltan = {}                    # fila -> bits de objetivos aún no alcanzados
+    for x, y in (objetivos if goal is None else (goal, *objetivos)):
+        faltan[y] = faltan.get(y, 0) | 1 << x
+    while pendientes:
+        y = pendientes.pop()
+        en_cola[y] = 0
+        r = alc[y] = _llenar(alc[y], libres[y], pasos)
+        if y in faltan:
+            faltan[y] &= ~r
+            if not faltan[y]:
+                del faltan[y]
+                if not faltan:
+                    break
+        for ny in (y - 1, y + 1):
+            if 0 <= ny < h:
+                nuevo = r & libres[ny] & ~alc[ny]
+                if nuevo:
+                    alc[ny] |= nuevo
+                    if not en_cola[ny]:
+                        en_cola[ny] = 1
+                        pendientes.append(ny)
+    return alc
+
+def separar_filas(libres, w: int, semillas):
+    """
+    Inunda a la vez desde cada celda libre de 'semillas' (una fila por turno
+    cada una, en orden FIFO) sobre los ints por fila 'libres'. Devuelve
+    (i, j, None) en cuanto las inundaciones i y j se tocan (están unidas) o
+    (i, None, zona) si la i se agota sin tocar a ninguna: 'zona' es su
+    componente completa como {fila: bits}. El trabajo queda acotado por el
+    rodeo más corto entre semillas o por la componente más chica.
+    """
+    h = len(libres)
+    pasos = _pasos(w)
+    alcs, colas, en_cola = [], [], []
+    for x, y in semillas:
+        alcs.append({y: 1 << x})
+        colas.append(deque([y]))
+        en_cola.append({y})
+    while True:
+        for i, alc in enumerate(alcs):
+            if not colas[i]:
+                return i, None, alc
+            y = colas[i].popleft()
+            en_cola[i].discard(y)
+            r = alc[y] = _llenar(alc[y], libres[y], pasos)
+            for j, otra in enumerate(alcs):
+                if j != i and otra.get(y, 0) & r:
+                    return i, j, None
+            for ny in (y - 1, y + 1):
+                if 0 <= ny < h:
+                    nuevo = r & libres[ny] & ~alc.get(ny, 0)
+                    if nuevo:
+                        alc[ny] = alc.get(ny, 0) | nuevo
+                        if ny not in en_cola[i]:
+                            en_cola[i].add(ny)
+                            colas[i].append(ny)
+
+# ------------------------ API ------------------------
+def componente(mask, start):
+    """Máscara bool (h, w) de la componente de 'start' en 'mask' (start cuenta como libre)."""
+    h, w = mask.shape
+    if w * h <= LIMITE_GLOBAL:
+        tb = Tablero(w, h)
+        return tb.a_mascara(tb.inundar(tb.bit(*start), tb.desde_mascara(mask)))
+    return filas_a_mascara(inundar_filas(filas_desde_mascara(mask), w, start), w)
+
+def hay_camino(mask, start, goal) -> bool:
+    """¿Hay camino de 'start' a 'goal' por celdas True de 'mask'? (start cuenta como libre)."""
+    h, w = mask.shape
+    if w * h <= LIMITE_GLOBAL:
+        tb = Tablero(w, h)
+        obj = tb.bit(*goal)
+        return bool(tb.inundar(tb.bit(*start), tb.desde_mascara(mask), obj) & obj)
+    alc = inundar_filas(filas_desde_mascara(mask), w, start, goal)
+    return bool(alc[goal[1]] >> goal[0] & 1)
@@ -0,0 +1,224 @@
+# camera.py
+# Cámara / viewport para mapas más grandes que la pantalla: sigue al tanque,
+# permite desplazar y hacer zoom, y el mapa se dibuja por bloques (chunks)
+# pre-renderizados de los que solo se blitean los que tocan la vista.
+# Así el costo del render depende del tamaño de la pantalla, no del mapa.
+import pygame
+
+from grid import Grid
+from word import _dibujar_celda
+
+ZOOM_MIN = 0.25
+ZOOM_MAX = 2.0
+CHUNK_PX = 512     # lado aproximado de un chunk en píxeles (a cualquier zoom)
+
+# ---------------------- sprites escalados ----------------------
+_ESCALADOS = {}
+
+def sprite_escalado(spr, px: int):
+    """'spr' reescalado a px x px (cacheado por sprite y tamaño)."""
+    if spr.get_width() == px and spr.get_height() == px:
+        return spr
+    key = (id(spr), px)
+    hit = _ESCALADOS.get(key)
+    if hit is None or hit[0] is not spr:
+        hit = _ESCALADOS[key] = (spr, pygame.transform.smoothscale(spr, (px, px)))
+    return hit[1]
+
+# ---------------------------- cámara ----------------------------
+class Camera:
+    """
+    Ventana 'view' (pygame.Rect en pantalla) sobre un mundo de grid_w x grid_h
+    celdas de 'tile' px a zoom 1.
+    - x, y: esquina visible del mundo, en px ya escalados por el zoom.
+    - Si el mundo (con zoom) es más chico que la vista, queda centrado.
+    - seguir(celda) mueve la cámara solo cuando la celda sale de la zona
+      central (margen), para no redibujar todo en cada paso.
+    """
+    def __init__(self, view, grid_w: int, grid_h: int, tile: int, zoom: float = 1.0):
+        self.view = pygame.Rect(view)
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.tile = tile
+        self.zoom = zoom
+        self.x = self.y = 0
+        self.siguiendo = True      # False tras desplazar a mano (hasta centrar())
+
+    @property
+    def tile_px(self) -> int:
+        return max(1, round(self.tile * self.zoom))
+
+    def tam_mundo(self):
+        t = self.tile_px
+        return self.grid_w * t, self.grid_h * t
+
+    def _limitar(self):
+        mw, mh = self.tam_mundo()
+        self.x = max(0, min(self.x, mw - self.view.w))
+        self.y = max(0, min(self.y, mh - self.view.h))
+
+    def offset(self):
+        """Posición en pantalla de la esquina (0, 0) del mundo."""
+        mw, mh = self.tam_mundo()
+        off_x = self.view.x - self.x if mw > self.view.w else self.view.x + (self.view.w - mw) // 2
+        off_y = self.view.y - self.y if mh > self.view.h else self.view.y + (self.view.h - mh) // 2
+        return off_x, off_y
+
+    def celdas_visibles(self):
+        """Rango de celdas (x0, y0, x1, y1), extremos 1 exclusivos, que tocan la vista."""
+        t = self.tile_px
+        off_x, off_y = self.offset()
+        x0 = max(0, (self.view.left - off_x) // t)
+        y0 = max(0, (self.view.top - off_y) // t)
+        x1 = min(self.grid_w, (self.view.right - off_x + t - 1) // t)
+        y1 = min(self.grid_h, (self.view.bottom - off_y + t - 1) // t)
+        return x0, y0, x1, y1
+
+    # ---------------- movimiento ----------------
+    def centrar(self, celda):
+        """Centra la vista en 'celda' y vuelve a seguir al tanque."""
+        t = self.tile_px
+        self.x = celda[0] * t + t // 2 - self.view.w // 2
+        self.y = celda[1] * t + t // 2 - self.view.h // 2
+        self._limitar()
+        self.siguiendo = True
+
+    def seguir(self, celda, margen: float = 0.25) -> bool:
+        """Si 'celda' sale de la zona central, desplaza la vista. True si se movió."""
+        if not self.siguiendo or celda is None:
+            return False
+        antes = (self.x, self.y)
+        t = self.tile_px
+        cx, cy = celda[0] * t, celda[1] * t
+        mx, my = int(self.view.w * margen), int(self.view.h * margen)
+        if cx < self.x + mx:                     self.x = cx - mx
+        elif cx + t > self.x + self.view.w - mx: self.x = cx + t - self.view.w + mx
+        if cy < self.y + my:                     self.y = cy - my
+        elif cy + t > self.y + self.view.h - my: self.y = cy + t - self.view.h + my
+        self._limitar()
+        return (self.x, self.y) != antes
+
+    def desplazar(self, dx: int, dy: int) -> bool:
+        """Desplaza la vista dx, dy px (deja de seguir al tanque). True si se movió."""
+        antes = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self._limitar()
+        self.siguiendo = False
+        return (self.x, self.y) != antes
+
+    def set_zoom(self, zoom: float) -> bool:
+        """Cambia el zoom manteniendo fijo el centro de la vista. True si cambió."""
+        zoom = max(ZOOM_MIN, min(ZOOM_MAX, zoom))
+        if zoom == self.zoom:
+            return False
+        t0 = self.tile_px
+        cx = (self.x + self.view.w / 2) / t0
+        cy = (self.y + self.view.h / 2) / t0
+        self.zoom = zoom
+        t = self.tile_px
+        self.x = int(cx * t - self.view.w / 2)
+        self.y = int(cy * t - self.view.h / 2)
+        self._limitar()
+        return True
+
+# ---------------------- mapa por chunks ----------------------
+class ChunkedMapLayer:
+    """
+    Mapa estático dividido en chunks de ~CHUNK_PX px, pre-renderizados al
+    tamaño de tile del zoom actual y solo cuando se vuelven visibles.
+    - draw(surface, camera) blitea los chunks que tocan camera.view.
+    - LRU de 'max_chunks' superficies (acota la memoria en mapas enormes).
+    - invalidate_cell(x, y) repinta esa celda en los chunks cacheados.
+    """
+    def __init__(self, grid, grid_w: int, grid_h: int, tile: int,
+                 dark_color, spr_grass, spr_brick, spr_win, max_chunks: int = 64):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.tile = tile
+        self.dark_color = dark_color
+        self.spr_grass = spr_grass
+        self.spr_brick = spr_brick
+        self.spr_win = spr_win
+        self.max_chunks = max_chunks
+        self.grid = grid
+        self._chunks = {}          # (cx, cy, tile_px) -> Surface (orden = LRU)
+        self.renderizados = 0      # chunks rasterizados (para medir)
+
+    def set_grid(self, grid):
+        """Cambia el grid (p. ej. al pulsar R) y descarta los chunks."""
+        self.grid = grid
+        self.invalidate()
+
+    def invalidate(self):
+        self._chunks.clear()
+
+    @staticmethod
+    def celdas_por_chunk(tile_px: int) -> int:
+        return max(1, CHUNK_PX // tile_px)
+
+    def _sprites(self, t):
+        return (sprite_escalado(self.spr_grass, t), sprite_escalado(self.spr_brick, t),
+                sprite_escalado(self.spr_win, t))
+
+    def _filas(self, x0, y0, x1, y1):
+        if isinstance(self.grid, Grid):
+            return self.grid.cells[y0:y1, x0:x1].tolist()
+        return [fila[x0:x1] for fila in self.grid[y0:y1]]
+
+    def _chunk(self, cx, cy, t):
+        key = (cx, cy, t)
+        surf = self._chunks.pop(key, None)
+        if surf is None:
+            n = self.celdas_por_chunk(t)
+            x0, y0 = cx * n, cy * n
+            x1, y1 = min(self.grid_w, x0 + n), min(self.grid_h, y0 + n)
+            surf = pygame.Surface(((x1 - x0) * t, (y1 - y0) * t))
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            grass, brick, win = self._sprites(t)
+            for j, fila in enumerate(self._filas(x0, y0, x1, y1)):
+                for i, cell in enumerate(fila):
+                    _dibujar_celda(surf, cell, pygame.Rect(i*t, j*t, t, t),
+                                   self.dark_color, grass, brick, win)
+            self.renderizados += 1
+            if len(self._chunks) >= self.max_chunks:
+                del self._chunks[next(iter(self._chunks))]
+        self._chunks[key] = surf   # al final: más reciente
+        return surf
+
+    def invalidate_cell(self, x: int, y: int):
+        cell = self.grid[y][x]
+        for (cx, cy, t), surf in self._chunks.items():
+            n = self.celdas_por_chunk(t)
+            if x // n == cx and y // n == cy:
+                grass, brick, win = self._sprites(t)
+                _dibujar_celda(surf, cell, pygame.Rect((x - cx*n) * t, (y - cy*n) * t, t, t),
+                               self.dark_color, grass, brick, win)
+
+    def draw(self, surface, camera):
+        """Dibuja la parte visible del mapa (recortada a camera.view); devuelve la vista."""
+        t = camera.tile_px
+        n = self.celdas_por_chunk(t)
+        off_x, off_y = camera.offset()
+        x0, y0, x1, y1 = camera.celdas_visibles()
+        clip = surface.get_clip()
+        surface.set_clip(camera.view)
+        for cy in range(y0 // n, (y1 - 1) // n + 1 if y1 > y0 else 0):
+            for cx in range(x0 // n, (x1 - 1) // n + 1 if x1 > x0 else 0):
+                surface.blit(self._chunk(cx, cy, t), (off_x + cx*n*t, off_y + cy*n*t))
+        surface.set_clip(clip)
+        return camera.view.copy()
+
+    def draw_cell(self, surface, camera, x: int, y: int):
+        """Restaura solo la celda (x, y) en pantalla; devuelve el rect (vacío si no se ve)."""
+        t = camera.tile_px
+        n = self.celdas_por_chunk(t)
+        off_x, off_y = camera.offset()
+        cx, cy = x // n, y // n
+        clip = surface.get_clip()
+        surface.set_clip(camera.view)
+        rect = surface.blit(self._chunk(cx, cy, t), (off_x + x*t, off_y + y*t),
+                            pygame.Rect((x - cx*n) * t, (y - cy*n) * t, t, t))
+        surface.set_clip(clip)
+        return rect
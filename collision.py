@@ -0,0 +1,119 @@
+# collision.py
+# Colisiones para muchas entidades sobre el grid de tiles:
+# - SpatialHash: hash espacial uniforme (una cubeta por celda) para saber
+#   qué entidades hay en una celda, un rect o a lo largo de un rayo sin
+#   comparar todas contra todas (costo ~ entidades, no entidades²).
+# - recorrer_rayo: celdas que atraviesa un segmento, en orden (DDA de
+#   Amanatides & Woo); las balas lo usan para chocar contra BRICK.
+import math
+
+class SpatialHash:
+    """
+    Cubetas de 'celda' px: (cx, cy) -> set de entidades cuyo rect la toca.
+    Las entidades solo necesitan ser hashables; el rect se pasa al
+    insertar/mover (pygame.Rect o cualquier objeto con left/top/right/bottom).
+    mover() no toca las cubetas si el rect sigue en las mismas celdas.
+    """
+    def __init__(self, celda: int):
+        self.celda = celda
+        self._cubetas = {}         # (cx, cy) -> set
+        self._de = {}              # entidad -> (x0, y0, x1, y1) celdas que ocupa
+
+    def _rango(self, rect):
+        c = self.celda
+        return (int(rect.left // c), int(rect.top // c),
+                int((rect.right - 1) // c), int((rect.bottom - 1) // c))
+
+    def insertar(self, ent, rect):
+        r = self._rango(rect)
+        self._de[ent] = r
+        x0, y0, x1, y1 = r
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cub = self._cubetas.get((cx, cy))
+                if cub is None:
+                    cub = self._cubetas[(cx, cy)] = set()
+                cub.add(ent)
+
+    def quitar(self, ent):
+        x0, y0, x1, y1 = self._de.pop(ent)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cub = self._cubetas[(cx, cy)]
+                cub.discard(ent)
+                if not cub:
+                    del self._cubetas[(cx, cy)]
+
+    def mover(self, ent, rect):
+        if self._de.get(ent) == self._rango(rect):
+            return
+        self.quitar(ent)
+        self.insertar(ent, rect)
+
+    def __len__(self):
+        return len(self._de)
+
+    def __contains__(self, ent):
+        return ent in self._de
+
+    # ---------------- consultas ----------------
+    def en_celda(self, cx: int, cy: int):
+        """Entidades que tocan la celda (cx, cy) (no modificar el set devuelto)."""
+        return self._cubetas.get((cx, cy), ())
+
+    def consultar(self, rect):
+        """Candidatas cuyo rect comparte alguna celda con 'rect' (falta el test fino)."""
+        x0, y0, x1, y1 = self._rango(rect)
+        if x0 == x1 and y0 == y1:
+            return set(self._cubetas.get((x0, y0), ()))
+        res = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cub = self._cubetas.get((cx, cy))
+                if cub:
+                    res |= cub
+        return res
+
+    def en_rayo(self, x0, y0, x1, y1):
+        """Entidades de las celdas que atraviesa el segmento, por celda y en orden."""
+        for cx, cy in recorrer_rayo(x0, y0, x1, y1, self.celda):
+            cub = self._cubetas.get((cx, cy))
+            if cub:
+                yield (cx, cy), cub
+
+# ------------------------ DDA por celdas ------------------------
+def recorrer_rayo(x0, y0, x1, y1, celda):
+    """
+    Celdas (cx, cy) que atraviesa el segmento (x0, y0) -> (x1, y1) en px,
+    de la inicial a la final, pasando por cada una una sola vez.
+    """
+    cx, cy = int(x0 // celda), int(y0 // celda)
+    ex, ey = int(x1 // celda), int(y1 // celda)
+    dx, dy = x1 - x0, y1 - y0
+    paso_x = 1 if dx > 0 else -1
+    paso_y = 1 if dy > 0 else -1
+    # t (0..1 sobre el segmento) en que se cruza el próximo borde vertical / horizontal
+    t_x = ((cx + (dx > 0)) * celda - x0) / dx if dx else math.inf
+    t_y = ((cy + (dy > 0)) * celda - y0) / dy if dy else math.inf
+    dt_x = celda / abs(dx) if dx else math.inf
+    dt_y = celda / abs(dy) if dy else math.inf
+
+    yield cx, cy
+    for _ in range(abs(ex - cx) + abs(ey - cy)):
+        if t_x < t_y:
+            cx += paso_x
+            t_x += dt_x
+        else:
+            cy += paso_y
+            t_y += dt_y
+        yield cx, cy
+
+def primer_solido(walk, grid_w, grid_h, x0, y0, x1, y1, celda):
+    """
+    Primera celda no caminable (o fuera del mapa) en el segmento; None si
+    está libre. 'walk' es la máscara plana del grid (Grid.walk).
+    """
+    for cx, cy in recorrer_rayo(x0, y0, x1, y1, celda):
+        if not (0 <= cx < grid_w and 0 <= cy < grid_h) or not walk[cy*grid_w + cx]:
+            return cx, cy
+    return None
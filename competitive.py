@@ -0,0 +1,171 @@
+# competitive.py
+# Modo COMPETITIVE: muchos tanques y balas sobre el mismo tablero.
+# Los tanques se mueven en píxeles (4 direcciones) y se bloquean contra
+# celdas no caminables y contra otros tanques; disparan balas que avanzan
+# por DDA celda a celda, rompen el primer BRICK que cruzan o impactan al
+# primer tanque de su trayectoria. Todas las consultas pasan por un
+# SpatialHash, así que el costo por paso crece con la cantidad de
+# entidades y no con su cuadrado.
+import random
+from time import perf_counter_ns
+
+import pygame
+
+from collision import SpatialHash, recorrer_rayo
+from grid import EMPTY, BRICK
+
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))   # 0:+x 1:-x 2:+y 3:-y
+
+class Tanque:
+    __slots__ = ("x", "y", "dir", "cooldown", "rect")
+
+    def __init__(self, x, y, lado, dir_):
+        self.x = x
+        self.y = y
+        self.dir = dir_
+        self.cooldown = 0.0
+        self.rect = pygame.Rect(int(x), int(y), lado, lado)
+
+class Bala:
+    __slots__ = ("x", "y", "dir", "dueno")
+
+    def __init__(self, x, y, dir_, dueno):
+        self.x = x
+        self.y = y
+        self.dir = dir_
+        self.dueno = dueno
+
+class Arena:
+    """
+    - step(dt_s): avanza tanques y balas dt_s segundos.
+    - cambios: celdas (x, y) que pasaron de BRICK a EMPTY desde la última
+      lectura (para ChunkedMapLayer.invalidate_cell); el consumidor la vacía.
+    - ns_paso: duración del último step (movimiento + colisiones).
+    El grid (Grid) se modifica con set() al romper ladrillos.
+    """
+    def __init__(self, grid, grid_w, grid_h, tile, n_tanques=100, lado=None,
+                 vel_tanque=120.0, vel_bala=480.0, cadencia=1.5, rng=None):
+        self.grid = grid
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.tile = tile
+        self.lado = lado or tile // 2
+        self.vel_tanque = vel_tanque
+        self.vel_bala = vel_bala
+        self.cadencia = cadencia
+        self.rng = rng or random.Random()
+        self.hash = SpatialHash(tile)
+        self.tanques = []
+        self.balas = []
+        self.cambios = []
+        self.impactos = 0
+        self.ladrillos_rotos = 0
+        self.ns_paso = 0
+        self.agregar_tanques(n_tanques)
+
+    # ---------------- tanques ----------------
+    def _choca_mapa(self, rect):
+        t, w, walk = self.tile, self.grid_w, self.grid.walk
+        x0, y0 = rect.left // t, rect.top // t
+        x1, y1 = (rect.right - 1) // t, (rect.bottom - 1) // t
+        if x0 < 0 or y0 < 0 or x1 >= w or y1 >= self.grid_h:
+            return True
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                if not walk[cy*w + cx]:
+                    return True
+        return False
+
+    def _choca_tanque(self, tanque, rect):
+        for otro in self.hash.consultar(rect):
+            if otro is not tanque and otro.rect.colliderect(rect):
+                return True
+        return False
+
+    def _lugar_libre(self, intentos=200):
+        """Esquina superior izquierda de un hueco libre centrado en una celda al azar."""
+        t, off = self.tile, (self.tile - self.lado) // 2
+        for _ in range(intentos):
+            cx, cy = self.rng.randrange(self.grid_w), self.rng.randrange(self.grid_h)
+            rect = pygame.Rect(cx*t + off, cy*t + off, self.lado, self.lado)
+            if not self._choca_mapa(rect) and not self._choca_tanque(None, rect):
+                return rect.x, rect.y
+        return None
+
+    def agregar_tanques(self, k):
+        for _ in range(k):
+            lugar = self._lugar_libre()
+            if lugar is None:
+                break
+            tq = Tanque(*lugar, self.lado, self.rng.randrange(4))
+            tq.cooldown = self.rng.random() * self.cadencia
+            self.tanques.append(tq)
+            self.hash.insertar(tq, tq.rect)
+
+    def quitar_tanques(self, k):
+        k = max(0, min(k, len(self.tanques)))
+        for tq in self.tanques[len(self.tanques) - k:]:
+            self.hash.quitar(tq)
+        del self.tanques[len(self.tanques) - k:]
+
+    def _reaparecer(self, tq):
+        lugar = self._lugar_libre()
+        if lugar is None:
+            return
+        tq.x, tq.y = lugar
+        tq.rect.topleft = lugar
+        self.hash.mover(tq, tq.rect)
+
+    def _mover_tanque(self, tq, d):
+        dx, dy = DIRS[tq.dir]
+        nx, ny = tq.x + dx*d, tq.y + dy*d
+        rect = pygame.Rect(int(nx), int(ny), self.lado, self.lado)
+        if self._choca_mapa(rect) or self._choca_tanque(tq, rect):
+            tq.dir = self.rng.randrange(4)   # bloqueado: probar otra dirección
+            return
+        tq.x, tq.y = nx, ny
+        tq.rect = rect
+        self.hash.mover(tq, rect)
+        if self.rng.random() < 0.01:
+            tq.dir = self.rng.randrange(4)
+
+    # ---------------- balas ----------------
+    def _avanzar_bala(self, b, d):
+        """Mueve la bala 'd' px; False si choca (ladrillo, borde o tanque)."""
+        dx, dy = DIRS[b.dir]
+        x0, y0 = b.x, b.y
+        x1, y1 = x0 + dx*d, y0 + dy*d
+        w, walk = self.grid_w, self.grid.walk
+        for cx, cy in recorrer_rayo(x0, y0, x1, y1, self.tile):
+            if not (0 <= cx < w and 0 <= cy < self.grid_h):
+                return False
+            if not walk[cy*w + cx]:
+                if self.grid.get(cx, cy) == BRICK:
+                    self.grid.set(cx, cy, EMPTY)
+                    self.cambios.append((cx, cy))
+                    self.ladrillos_rotos += 1
+                return False
+            for tq in self.hash.en_celda(cx, cy):
+                if tq is not b.dueno and tq.rect.clipline(x0, y0, x1, y1):
+                    self.impactos += 1
+                    self._reaparecer(tq)
+                    return False
+        b.x, b.y = x1, y1
+        return True
+
+    # ---------------- paso ----------------
+    def step(self, dt_s):
+        t0 = perf_counter_ns()
+        d = self.vel_tanque * dt_s
+        for tq in self.tanques:
+            self._mover_tanque(tq, d)
+            tq.cooldown -= dt_s
+            if tq.cooldown <= 0:
+                tq.cooldown = self.cadencia * (0.5 + self.rng.random())
+                dx, dy = DIRS[tq.dir]
+                cx, cy = tq.rect.center
+                self.balas.append(Bala(cx + dx*(self.lado // 2 + 1), cy + dy*(self.lado // 2 + 1),
+                                       tq.dir, tq))
+        d = self.vel_bala * dt_s
+        self.balas = [b for b in self.balas if self._avanzar_bala(b, d)]
+        self.ns_paso = perf_counter_ns() - t0
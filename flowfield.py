@@ -0,0 +1,101 @@
+# flowfield.py
+# Campo de distancias hacia una meta común (flow field): una sola BFS
+# inversa desde la meta sirve para todos los tanques que van hacia ella.
+# La siguiente celda de cualquier tanque es una consulta O(1) y la ruta
+# completa (para RouteFollower) se obtiene siguiendo las direcciones.
+from array import array
+
+from grid import Grid
+
+SIN_DIR = 255          # celda sin camino a la meta
+
+class FlowField:
+    """
+    - dist: array('i') plano con la distancia (en pasos) a 'goal'; -1 si no llega.
+    - dirs: bytearray plano con el índice del vecino que acerca a la meta
+      (0:+x, 1:-x, 2:+y, 3:-y) o SIN_DIR.
+    Se reutiliza entre frames; con un Grid, is_stale() detecta cambios por
+    'version' y actualizar() lo reconstruye. Con list[list[int]] hay que
+    llamar a build() a mano tras modificar el mapa.
+    """
+    def __init__(self, grid, goal, grid_w, grid_h, walkable: set):
+        self.grid = grid
+        self.goal = goal
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.walkable = walkable
+        self.build()
+
+    def build(self):
+        """BFS inversa desde la meta (costo uniforme por paso)."""
+        w, n = self.grid_w, self.grid_w * self.grid_h
+        if isinstance(self.grid, Grid):
+            walk = self.grid.walk_bytes(self.walkable)
+            self._version = self.grid.version
+        else:
+            walk = bytes(1 if c in self.walkable else 0 for fila in self.grid for c in fila)
+            self._version = None
+        self.offsets = (1, -1, w, -w)
+
+        dist = array("i", [-1]) * n
+        dirs = bytearray([SIN_DIR]) * n
+        g = self.goal[1]*w + self.goal[0]
+        dist[g] = 0
+        cola = [g]
+        for i in cola:  # la lista crece mientras se recorre (BFS sin deque)
+            x = i % w
+            d = dist[i] + 1
+            # vecino j llega a i moviéndose en la dirección opuesta
+            for j, k in ((i + 1 if x + 1 < w else -1, 1), (i - 1 if x > 0 else -1, 0),
+                         (i + w, 3), (i - w, 2)):
+                if 0 <= j < n and dist[j] < 0 and walk[j]:
+                    dist[j] = d
+                    dirs[j] = k
+                    cola.append(j)
+        self.dist = dist
+        self.dirs = dirs
+
+    def is_stale(self) -> bool:
+        return isinstance(self.grid, Grid) and self.grid.version != self._version
+
+    def actualizar(self):
+        """Reconstruye solo si el grid cambió desde el último build()."""
+        if self.is_stale():
+            self.build()
+
+    def distancia(self, cell) -> int:
+        return self.dist[cell[1]*self.grid_w + cell[0]]
+
+    def next_step(self, cell):
+        """Siguiente celda hacia la meta (O(1)); None en la meta o sin camino."""
+        w = self.grid_w
+        i = cell[1]*w + cell[0]
+        k = self.dirs[i]
+        if k == SIN_DIR:
+            if i == self.goal[1]*w + self.goal[0]:
+                return None
+            # celda fuera del campo (p. ej. el start TANK_C): mejor vecino
+            j = self._mejor_vecino(i)
+            return None if j < 0 else (j % w, j // w)
+        j = i + self.offsets[k]
+        return (j % w, j // w)
+
+    def _mejor_vecino(self, i):
+        w, n = self.grid_w, self.grid_w * self.grid_h
+        x = i % w
+        best, best_d = -1, -1
+        for j in (i + 1 if x + 1 < w else -1, i - 1 if x > 0 else -1, i + w, i - w):
+            if 0 <= j < n and self.dist[j] >= 0 and (best < 0 or self.dist[j] < best_d):
+                best, best_d = j, self.dist[j]
+        return best
+
+    def ruta(self, start):
+        """Ruta completa desde 'start' hasta la meta (formato de RouteFollower); [] si no hay."""
+        ruta = [start]
+        cell = start
+        while cell != self.goal:
+            cell = self.next_step(cell)
+            if cell is None:
+                return []
+            ruta.append(cell)
+        return ruta
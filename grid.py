@@ -0,0 +1,103 @@
+# grid.py
+# Grid compacto respaldado por NumPy: un byte por celda (uint8) + máscara
+# booleana de celdas caminables precalculada. Se indexa igual que la lista
+# de listas original (grid[y][x]), así que word/agent/render lo aceptan tal
+# cual; los bucles calientes usan índices planos (i = y*w + x) y la máscara.
+import hashlib
+
+import numpy as np
+
+EMPTY, GRASS, BRICK, TANK_C, WIN_C = 0, 1, 2, 3, 4
+WALKABLE = frozenset({EMPTY, GRASS, WIN_C})
+
+class Grid:
+    """
+    Mapa de 'h' filas x 'w' columnas.
+    - cells: np.ndarray uint8 (h, w) con los códigos de celda.
+    - mask:  np.ndarray bool (h, w), True donde la celda es caminable
+      (vista sobre 'walk': comparten memoria).
+    - walk:  bytearray plano de la máscara (acceso rápido desde Python);
+      quien lo recibe solo debe leerlo.
+    - version: se incrementa en cada set(); las cachés que dependen del
+      contenido (p. ej. agent.PathCache) la usan para invalidarse.
+    Las modificaciones deben pasar por set() para mantener todo coherente;
+    set() parcha la celda en cada máscara cacheada en vez de recalcularlas.
+    """
+    __slots__ = ("w", "h", "cells", "walkable", "mask", "walk", "_masks",
+                 "version", "_hash")
+
+    def __init__(self, cells, walkable=WALKABLE):
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+        self.h, self.w = self.cells.shape
+        self.walkable = frozenset(walkable)
+        self._masks = {}
+        self.version = 0
+        self._hash = None
+        self._rebuild_mask()
+
+    @classmethod
+    def from_list(cls, rows, walkable=WALKABLE):
+        return cls(np.array(rows, dtype=np.uint8), walkable)
+
+    @classmethod
+    def empty(cls, w: int, h: int, fill: int = EMPTY, walkable=WALKABLE):
+        return cls(np.full((h, w), fill, dtype=np.uint8), walkable)
+
+    def to_list(self):
+        return self.cells.tolist()
+
+    def _rebuild_mask(self):
+        self._masks.clear()
+        self.walk = bytearray(np.isin(self.cells, list(self.walkable)).tobytes())
+        self.mask = np.frombuffer(self.walk, dtype=bool).reshape(self.h, self.w)
+        self._masks[self.walkable] = self.walk
+
+    # ---------- acceso estilo lista de listas ----------
+    def __getitem__(self, y):
+        return self.cells[y]
+
+    def __len__(self):
+        return self.h
+
+    def get(self, x: int, y: int) -> int:
+        return int(self.cells[y, x])
+
+    def set(self, x: int, y: int, code: int):
+        """Cambia una celda y mantiene las máscaras al día (O(máscaras cacheadas), no O(mapa))."""
+        self.cells[y, x] = code
+        self.version += 1
+        i = y*self.w + x
+        for key, m in self._masks.items():   # incluye self.walk (y por ende self.mask)
+            m[i] = code in key
+
+    def content_hash(self) -> bytes:
+        """Hash del contenido (dimensiones + celdas); se recalcula solo si cambió 'version'."""
+        if self._hash is None or self._hash[0] != self.version:
+            h = hashlib.blake2b(self.cells.tobytes(), digest_size=16)
+            h.update(self.w.to_bytes(4, "little") + self.h.to_bytes(4, "little"))
+            self._hash = (self.version, h.digest())
+        return self._hash[1]
+
+    # ---------- máscara caminable ----------
+    def walk_bytes(self, walkable=None) -> bytearray:
+        """
+        Máscara plana (1 byte por celda, 0/1) para el conjunto 'walkable'.
+        Se cachea por conjunto (set() la mantiene al día); por defecto, el
+        del propio grid. Es de solo lectura para quien la recibe.
+        """
+        key = self.walkable if walkable is None else frozenset(walkable)
+        m = self._masks.get(key)
+        if m is None:
+            m = bytearray(np.isin(self.cells, list(key)).tobytes())
+            self._masks[key] = m
+        return m
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return bool(self.walk[y*self.w + x])
+
+    # ---------- índices planos ----------
+    def idx(self, x: int, y: int) -> int:
+        return y*self.w + x
+
+    def xy(self, i: int):
+        return i % self.w, i // self.w
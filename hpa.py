@@ -0,0 +1,355 @@
+# hpa.py
+# Búsqueda jerárquica (HPA*, Botea et al.) para mundos grandes: el grid se
+# divide en clusters de CLUSTER x CLUSTER celdas; en los bordes entre
+# clusters se eligen celdas de entrada y, dentro de cada cluster, se
+# precalculan las distancias entre sus entradas. Una consulta busca en ese
+# grafo abstracto (pocos nodos) y luego refina cada tramo con una BFS local.
+# La ruta es casi óptima (no siempre la más corta) y con el mismo formato
+# que a_star_camino: lista de celdas (x, y) de start a goal.
+#
+# Uso (contrasta HPA* con A* sobre niveles generados):
+#   python hpa.py --niveles 300 --clusters 4,8,16
+import argparse
+import random
+import sys
+from heapq import heappush, heappop
+
+from grid import Grid
+
+CLUSTER = 16
+MAX_ENTRADA = 6     # tramos de borde más largos dan dos entradas (en los extremos)
+
+class HPAStar:
+    """
+    Abstracción del nivel, construida una vez y reutilizada entre consultas.
+    - ruta(start, goal): lista de celdas; [] si no hay camino.
+    - notify_cell_changed(x, y): relee la celda del grid y reconstruye solo
+      su cluster (y el vecino, si la celda está en un borde).
+    - expansiones: nodos abstractos expandidos (acumulado).
+    - reconstrucciones: clusters cuyas distancias internas se recalcularon.
+    'version' se incrementa con cada cambio del mapa (como en DStarLite).
+    """
+    def __init__(self, grid, grid_w, grid_h, walkable: set, cluster: int = CLUSTER):
+        self.grid = grid
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.walkable = walkable
+        self.cluster = cluster
+        self.ncx = (grid_w + cluster - 1) // cluster
+        self.ncy = (grid_h + cluster - 1) // cluster
+
+        if isinstance(grid, Grid):
+            self.walk = bytearray(grid.walk_bytes(walkable))
+        else:
+            self.walk = bytearray(1 if c in walkable else 0 for fila in grid for c in fila)
+
+        self._entradas = {}        # (cx, cy, eje) -> [(a, b)]; eje 0: borde derecho, 1: inferior
+        self._inter = {}           # nodo -> set de nodos al otro lado del borde (costo 1)
+        self._intra = {}           # (cx, cy) -> {nodo: {nodo: distancia}}
+        self.version = 0
+        self.expansiones = 0
+        self.reconstrucciones = 0
+        self.build()
+
+    # ---------------- construcción ----------------
+    def build(self):
+        """Abstracción completa: entradas de todos los bordes y distancias internas."""
+        self._entradas.clear()
+        self._inter.clear()
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                if cx + 1 < self.ncx: self._borde(cx, cy, 0)
+                if cy + 1 < self.ncy: self._borde(cx, cy, 1)
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                self._rebuild_intra((cx, cy))
+
+    def _cluster(self, i):
+        return (i % self.grid_w) // self.cluster, (i // self.grid_w) // self.cluster
+
+    def _limites(self, c):
+        C = self.cluster
+        x0, y0 = c[0] * C, c[1] * C
+        return x0, y0, min(self.grid_w, x0 + C), min(self.grid_h, y0 + C)
+
+    def _borde(self, cx, cy, eje):
+        """(Re)calcula las entradas del borde derecho (eje 0) o inferior (eje 1) de (cx, cy)."""
+        key = (cx, cy, eje)
+        inter = self._inter
+        for a, b in self._entradas.pop(key, ()):
+            for u, v in ((a, b), (b, a)):
+                vecinos = inter.get(u)
+                if vecinos is not None:
+                    vecinos.discard(v)
+                    if not vecinos:
+                        del inter[u]
+
+        w, walk = self.grid_w, self.walk
+        x0, y0, x1, y1 = self._limites((cx, cy))
+        if eje == 0:
+            celdas = [(y*w + x1 - 1, 1) for y in range(y0, y1)]
+        else:
+            celdas = [((y1 - 1)*w + x, w) for x in range(x0, x1)]
+
+        pares = []
+        tramo = []
+        for a, d in celdas + [(None, 0)]:   # centinela: cierra el último tramo
+            if a is not None and walk[a] and walk[a + d]:
+                tramo.append((a, a + d))
+                continue
+            if tramo:
+                if len(tramo) < MAX_ENTRADA:
+                    pares.append(tramo[len(tramo) // 2])
+                else:
+                    pares.extend((tramo[0], tramo[-1]))
+                tramo = []
+
+        for a, b in pares:
+            inter.setdefault(a, set()).add(b)
+            inter.setdefault(b, set()).add(a)
+        self._entradas[key] = pares
+
+    def _nodos_de(self, c):
+        cx, cy = c
+        E = self._entradas
+        nodos = {a for a, _ in E.get((cx, cy, 0), ())}
+        nodos.update(b for _, b in E.get((cx - 1, cy, 0), ()))
+        nodos.update(a for a, _ in E.get((cx, cy, 1), ()))
+        nodos.update(b for _, b in E.get((cx, cy - 1, 1), ()))
+        return nodos
+
+    def _ady_local(self, c):
+        """Vecinos caminables de cada celda caminable del cluster 'c' (sin salir de él)."""
+        w, walk = self.grid_w, self.walk
+        x0, y0, x1, y1 = self._limites(c)
+        ady = {}
+        for y in range(y0, y1):
+            for i in range(y*w + x0, y*w + x1):
+                if not walk[i]:
+                    continue
+                x = i % w
+                ady[i] = tuple(j for j in (i + 1 if x + 1 < x1 else -1, i - 1 if x > x0 else -1,
+                                           i + w if y + 1 < y1 else -1, i - w if y > y0 else -1)
+                               if j >= 0 and walk[j])
+        return ady
+
+    def _bfs_local(self, origen, c, objetivo=-1, ady=None):
+        """BFS restringida al cluster 'c'. Devuelve (dist, parent); corta al llegar a 'objetivo'.
+        'origen' puede no ser caminable (el start del tanque)."""
+        if ady is None:
+            ady = self._ady_local(c)
+        if origen not in ady:
+            w, walk = self.grid_w, self.walk
+            x0, y0, x1, y1 = self._limites(c)
+            x, y = origen % w, origen // w
+            ady = dict(ady)
+            ady[origen] = tuple(j for j in (origen + 1 if x + 1 < x1 else -1, origen - 1 if x > x0 else -1,
+                                            origen + w if y + 1 < y1 else -1, origen - w if y > y0 else -1)
+                                if j >= 0 and walk[j])
+        dist = {origen: 0}
+        parent = {origen: -1}
+        cola = [origen]
+        for i in cola:  # la lista crece mientras se recorre (BFS sin deque)
+            if i == objetivo:
+                break
+            d = dist[i] + 1
+            for j in ady[i]:
+                if j not in dist:
+                    dist[j] = d
+                    parent[j] = i
+                    cola.append(j)
+        return dist, parent
+
+    def _rebuild_intra(self, c):
+        nodos = self._nodos_de(c)
+        ady = self._ady_local(c) if nodos else None
+        tabla = {}
+        for n in nodos:
+            dist, _ = self._bfs_local(n, c, ady=ady)
+            tabla[n] = {m: dist[m] for m in nodos if m != n and m in dist}
+        self._intra[c] = tabla
+        self.reconstrucciones += 1
+
+    # ---------------- cambios del mapa ----------------
+    def notify_cell_changed(self, x: int, y: int):
+        """La celda (x, y) del grid cambió: reconstruye solo los clusters afectados."""
+        i = y*self.grid_w + x
+        nuevo = 1 if self.grid[y][x] in self.walkable else 0
+        if nuevo == self.walk[i]:
+            return
+        self.walk[i] = nuevo
+        C = self.cluster
+        cx, cy = x // C, y // C
+        afectados = {(cx, cy)}
+        # bordes cuya línea contiene la celda: cambian sus entradas
+        if x % C == C - 1 and cx + 1 < self.ncx:
+            self._borde(cx, cy, 0); afectados.add((cx + 1, cy))
+        if x % C == 0 and cx > 0:
+            self._borde(cx - 1, cy, 0); afectados.add((cx - 1, cy))
+        if y % C == C - 1 and cy + 1 < self.ncy:
+            self._borde(cx, cy, 1); afectados.add((cx, cy + 1))
+        if y % C == 0 and cy > 0:
+            self._borde(cx, cy - 1, 1); afectados.add((cx, cy - 1))
+        for c in afectados:
+            self._rebuild_intra(c)
+        self.version += 1
+
+    # ---------------- consultas ----------------
+    def ruta(self, start, goal):
+        """Ruta casi óptima de 'start' a 'goal' (incluye ambos); [] si no hay camino."""
+        w = self.grid_w
+        s = start[1]*w + start[0]
+        t = goal[1]*w + goal[0]
+        if s == t:
+            return [start]
+        if not self.walk[t]:
+            return []
+
+        # aristas temporales: start y goal contra las entradas de su cluster
+        cs, ct = self._cluster(s), self._cluster(t)
+        extra = {s: {}, t: {}}
+        fuentes = [s]
+        # el start (TANK_C) no es caminable y _borde no crea entradas en él:
+        # si está en un borde, sus vecinos caminables del cluster de al lado
+        # se enlazan a mano (como search._preparar, que lo da por libre)
+        x, y = start
+        for j in (s + 1 if x + 1 < w else -1, s - 1 if x > 0 else -1,
+                  s + w if y + 1 < self.grid_h else -1, s - w if y > 0 else -1):
+            if j >= 0 and self.walk[j] and self._cluster(j) != cs:
+                extra[s][j] = 1
+                extra.setdefault(j, {})[s] = 1
+                fuentes.append(j)
+        for f in fuentes:
+            cf = self._cluster(f)
+            dist_f, _ = self._bfs_local(f, cf)
+            for m in self._intra[cf]:
+                if m in dist_f and m != f:
+                    extra[f][m] = dist_f[m]
+                    extra.setdefault(m, {})[f] = dist_f[m]
+            if cf == ct and t in dist_f and t != f:
+                extra[f][t] = extra[t][f] = dist_f[t]
+        dist_t, _ = self._bfs_local(t, ct)
+        for m in self._intra[ct]:
+            if m in dist_t and m != t:
+                extra[t][m] = dist_t[m]
+                extra.setdefault(m, {})[t] = dist_t[m]
+
+        abstracta = self._a_star_abstracto(s, t, extra)
+        return self._refinar(abstracta) if abstracta else []
+
+    def _a_star_abstracto(self, s, t, extra):
+        w = self.grid_w
+        gx, gy = t % w, t // w
+        intra, inter = self._intra, self._inter
+        g = {s: 0}
+        parent = {s: -1}
+        heap = [(0, 0, s)]
+        while heap:
+            _, gc, cur = heappop(heap)
+            if gc > g[cur]:
+                continue
+            self.expansiones += 1
+            if cur == t:
+                camino = []
+                while cur != -1:
+                    camino.append(cur)
+                    cur = parent[cur]
+                camino.reverse()
+                return camino
+            vecinos = list(intra[self._cluster(cur)].get(cur, {}).items())
+            vecinos.extend((m, 1) for m in inter.get(cur, ()))
+            vecinos.extend(extra.get(cur, {}).items())
+            for m, d in vecinos:
+                tentative = gc + d
+                if tentative < g.get(m, tentative + 1):
+                    g[m] = tentative
+                    parent[m] = cur
+                    heappush(heap, (tentative + abs(m % w - gx) + abs(m // w - gy), tentative, m))
+        return []
+
+    def _refinar(self, abstracta):
+        """Convierte la ruta abstracta en celdas: BFS local por tramo dentro de un cluster."""
+        w = self.grid_w
+        ruta = [abstracta[0]]
+        for a, b in zip(abstracta, abstracta[1:]):
+            c = self._cluster(a)
+            if c != self._cluster(b):     # arista entre clusters: celdas vecinas
+                ruta.append(b)
+                continue
+            _, parent = self._bfs_local(a, c, b)
+            tramo = []
+            cur = b
+            while cur != a:
+                tramo.append(cur)
+                cur = parent[cur]
+            tramo.reverse()
+            ruta.extend(tramo)
+        return [(i % w, i // w) for i in ruta]
+
+# ------------------ misma firma que a_star_camino ------------------
+_ULTIMA = None      # (clave, HPAStar) de la última abstracción construida
+
+def hpa_camino(grid, start, goal, grid_w, grid_h, walkable: set):
+    """
+    Ruta con HPA* (lista de celdas, [] si no hay camino). Con un Grid la
+    abstracción se reutiliza mientras no cambie 'version'; para cambios
+    celda a celda conviene un HPAStar propio con notify_cell_changed().
+    """
+    global _ULTIMA
+    if not isinstance(grid, Grid):
+        return HPAStar(grid, grid_w, grid_h, walkable).ruta(start, goal)
+    clave = (id(grid), grid.version, grid_w, grid_h, frozenset(walkable))
+    if _ULTIMA is None or _ULTIMA[0] != clave:
+        _ULTIMA = (clave, HPAStar(grid, grid_w, grid_h, walkable))   # guarda el grid: el id no se reusa
+    return _ULTIMA[1].ruta(start, goal)
+
+# ---------------------------- verificación ----------------------------
+def _ruta_valida(grid, ruta, start, goal):
+    if ruta[0] != start or ruta[-1] != goal:
+        return False
+    return all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and grid.is_walkable(*b)
+               for a, b in zip(ruta, ruta[1:]))
+
+def verificar(niveles: int, grid_w: int, grid_h: int, clusters=(4, 8, 16), seed0: int = 0,
+              densidades=(0.10, 0.30, 0.45)):
+    """
+    Compara HPAStar(cluster).ruta con a_star_camino en 'niveles' niveles por
+    densidad de BRICK (seeds seed0...). Devuelve {cluster: (fallos, peor)}:
+    fallos = niveles donde una encuentra camino y la otra no, o la ruta HPA*
+    no es válida; peor = mayor cociente longitud HPA* / óptima.
+    """
+    import word
+    from agent import a_star_camino
+    res = {c: [0, 1.0] for c in clusters}
+    for densidad in densidades:
+        for seed in range(seed0, seed0 + niveles):
+            random.seed(seed)
+            grid, start, goal = word.generar_nivel(
+                grid_w, grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+                densidad_brick=densidad, como_grid=True, metodo="conexo")
+            ref = a_star_camino(grid, start, goal, grid_w, grid_h, word.WALKABLE)
+            for c in clusters:
+                ruta = HPAStar(grid, grid_w, grid_h, word.WALKABLE, c).ruta(start, goal)
+                if bool(ruta) != bool(ref) or (ruta and not _ruta_valida(grid, ruta, start, goal)):
+                    res[c][0] += 1
+                elif len(ref) > 1:
+                    res[c][1] = max(res[c][1], (len(ruta) - 1) / (len(ref) - 1))
+    return {c: tuple(v) for c, v in res.items()}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Contrasta HPA* con A* sobre niveles generados.")
+    p.add_argument("--niveles", type=int, default=300, help="niveles por densidad de BRICK")
+    p.add_argument("--seed", type=int, default=0, help="primera seed del rango")
+    p.add_argument("--ancho", type=int, default=22)
+    p.add_argument("--alto", type=int, default=12)
+    p.add_argument("--clusters", default="4,8,16", help="tamaños de cluster separados por coma")
+    a = p.parse_args(argv)
+
+    clusters = tuple(int(c) for c in a.clusters.split(","))
+    res = verificar(a.niveles, a.ancho, a.alto, clusters, a.seed)
+    for c, (fallos, peor) in res.items():
+        print(f"cluster {c:>3}: {fallos} fallos de {3 * a.niveles} | peor longitud / óptima {peor:.2f}")
+    return 1 if any(f for f, _ in res.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# levels.py
+# Formato binario de niveles (3 bits por celda) y packs de niveles leídos
+# con mmap y acceso O(1) por índice. Sirve para pre-generar corpus grandes
+# una sola vez y cargar cualquier nivel sin regenerarlo ni parsear texto.
+#
+# Nivel:  <HHHHHHQ> ancho, alto, start x/y, goal x/y, seed + celdas empaquetadas
+#         (códigos EMPTY/GRASS/BRICK/TANK_C/WIN_C en 3 bits, MSB primero).
+# Pack:   <4sHxxQQ> "TNKP", versión, cantidad, offset del índice
+#         + niveles uno tras otro + índice final de offsets (uint64).
+#
+# Uso:
+#   python levels.py pack.tnk --niveles 100000 --ancho 64 --alto 64
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # word importa pygame (no abre ventana)
+
+import argparse
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from grid import Grid
+import word
+
+MAGIC = b"TNKP"
+VERSION = 1
+_PACK = struct.Struct("<4sHxxQQ")
+_NIVEL = struct.Struct("<HHHHHHQ")
+BITS = 3
+
+# ---------------------- un nivel ----------------------
+def _celdas(grid):
+    return np.asarray(grid.cells if isinstance(grid, Grid) else grid, dtype=np.uint8)
+
+def empaquetar_nivel(grid, start, goal, seed: int = 0) -> bytes:
+    """Serializa un nivel (list[list[int]] o Grid) a bytes."""
+    cells = _celdas(grid)
+    h, w = cells.shape
+    if cells.size and int(cells.max()) >= 1 << BITS:
+        raise ValueError("código de celda fuera de rango para 3 bits")
+    bits = (cells.reshape(-1, 1) >> np.array([2, 1, 0], dtype=np.uint8)) & 1
+    return _NIVEL.pack(w, h, *start, *goal, seed) + np.packbits(bits.ravel()).tobytes()
+
+def _tam_nivel(w, h) -> int:
+    return _NIVEL.size + (w * h * BITS + 7) // 8
+
+def desempaquetar_nivel(buf, offset: int = 0):
+    """Lee un nivel desde 'buf' (bytes o mmap). Devuelve (Grid, start, goal, seed)."""
+    w, h, sx, sy, gx, gy, seed = _NIVEL.unpack_from(buf, offset)
+    n = w * h
+    ini = offset + _NIVEL.size
+    packed = np.frombuffer(buf, dtype=np.uint8, count=(n * BITS + 7) // 8, offset=ini)
+    bits = np.unpackbits(packed, count=n * BITS).reshape(n, BITS)
+    cells = (bits[:, 0] << 2) | (bits[:, 1] << 1) | bits[:, 2]
+    return Grid(cells.reshape(h, w)), (sx, sy), (gx, gy), seed
+
+# ---------------------- packs ----------------------
+class LevelPackWriter:
+    """
+    Escritor en streaming: add() agrega un nivel al final del archivo y
+    close() escribe el índice de offsets y actualiza la cabecera.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(_PACK.pack(MAGIC, VERSION, 0, 0))
+        self._offsets = array("Q")
+
+    def add(self, grid, start, goal, seed: int = 0):
+        self._offsets.append(self._f.tell())
+        self._f.write(empaquetar_nivel(grid, start, goal, seed))
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        if self._f is None:
+            return
+        index_off = self._f.tell()
+        self._f.write(self._offsets.tobytes())
+        self._f.seek(0)
+        self._f.write(_PACK.pack(MAGIC, VERSION, len(self._offsets), index_off))
+        self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class LevelPack:
+    """Pack de solo lectura mapeado en memoria; pack[i] -> (Grid, start, goal, seed)."""
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, index_off = _PACK.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: no es un pack de niveles v{VERSION}")
+        self._n = count
+        self._index = np.frombuffer(self._mm, dtype="<u8", count=count, offset=index_off)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if i < 0: i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return desempaquetar_nivel(self._mm, int(self._index[i]))
+
+    def close(self):
+        self._index = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def generar_pack(path, n: int, grid_w: int, grid_h: int, seed0: int = 0,
+                 densidad_brick: float = 0.30, densidad_grass: float = 0.15,
+                 metodo: str = "conexo"):
+    """Genera 'n' niveles con word.generar_nivel (seed = seed0 + i) directo al pack."""
+    with LevelPackWriter(path) as wr:
+        for seed in range(seed0, seed0 + n):
+            random.seed(seed)
+            grid, start, goal = word.generar_nivel(
+                grid_w, grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+                densidad_brick=densidad_brick, densidad_grass=densidad_grass,
+                como_grid=True, metodo=metodo)
+            wr.add(grid, start, goal, seed)
+    return n
+
+# ---------------------------- CLI ----------------------------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Genera un pack binario de niveles Tank 1990.")
+    p.add_argument("salida")
+    p.add_argument("--niveles", type=int, default=10000)
+    p.add_argument("--seed", type=int, default=0, help="primera seed del rango")
+    p.add_argument("--ancho", type=int, default=22)
+    p.add_argument("--alto", type=int, default=12)
+    p.add_argument("--densidad-brick", type=float, default=0.30)
+    p.add_argument("--densidad-grass", type=float, default=0.15)
+    p.add_argument("--metodo", choices=("conexo", "rechazo"), default="conexo")
+    a = p.parse_args(argv)
+
+    generar_pack(a.salida, a.niveles, a.ancho, a.alto, a.seed,
+                 a.densidad_brick, a.densidad_grass, a.metodo)
+    print(f"{a.niveles} niveles -> {a.salida} ({os.path.getsize(a.salida)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,20 @@
 # main.py
+import os
 import sys
+import functools
 import pygame
 import pygame.freetype
 
-from agent import RandomExplorer, a_star_camino, RouteFollower  # modos del agente
+from agent import RandomExplorer, RouteFollower, tiempo_terreno, costo_ruta  # modos del agente
+import search                                                   # estrategias de búsqueda (registro)
+from camera import Camera, ChunkedMapLayer, sprite_escalado     # viewport con zoom + mapa por chunks
+from prefetch import LevelPrefetcher                            # niveles + rutas en segundo plano
+from competitive import Arena                                   # modo COMPETITIVE (hash espacial + DDA)
 import word                                                     # mundo (grid/dibujo)
+from render import DirtyRenderer, fuente                        # render por rects sucios + textos cacheados
+import assets                                                   # caché de imágenes escaladas
+from profiler import FrameProfiler                              # perfilador de frames (F3)
+from timestep import FixedTimestep, VELOCIDADES                 # paso fijo + multiplicador
 
 # ===================== INICIALIZACIÓN =====================
 pygame.init()
@@ -32,21 +42,133 @@ BRICK  = 2
 TANK_C = 3
 WIN_C  = 4
 
+# Tamaño del mundo generado en los modos de agente: por defecto el tablero
+# de arriba; TANK_MUNDO=ANCHOxALTO (p. ej. 512x512) lo agranda y la cámara
+# muestra solo la parte visible.
+def _tam_mundo():
+    try:
+        w, h = (int(v) for v in os.environ.get("TANK_MUNDO", "").lower().split("x"))
+    except ValueError:
+        return GRID_W, GRID_H
+    return w, h
+
+MUNDO_W, MUNDO_H = _tam_mundo()
+
 # ===================== CARGA DE ASSETS ====================
 def load_scaled(path, w, h):
-    """Carga un PNG con alpha y lo reescala a (w,h)."""
-    img = pygame.image.load(path).convert_alpha()
-    return pygame.transform.smoothscale(img, (w, h))
+    """Carga un PNG con alpha y lo reescala a (w,h) (vía la caché en disco de assets.py)."""
+    return assets.cargar_escalado(path, w, h, alpha=True)
 
 SPR_TANK  = load_scaled("tank.png",  TILE, TILE)
 SPR_BRICK = load_scaled("brick.png", TILE, TILE)
 SPR_GRASS = load_scaled("grass.png", TILE, TILE)
 SPR_WIN   = load_scaled("win.png",   TILE, TILE)
-try:
-    BG_IMG = pygame.image.load("bg.jpg").convert()
-    BG_IMG = pygame.transform.smoothscale(BG_IMG, (WIDTH, HEIGHT))
-except Exception:
-    BG_IMG = None  # fondo opcional
+
+@functools.lru_cache(maxsize=None)
+def fondo():
+    """Fondo a pantalla completa, cargado la primera vez que se necesita."""
+    try:
+        return assets.cargar_escalado("bg.jpg", WIDTH, HEIGHT, alpha=False)
+    except Exception:
+        return None  # fondo opcional
+
+# ===================== PERFILADOR (F3) ====================
+PROF = FrameProfiler.desde_entorno()   # TANK_PROFILE=1 para arrancar activo
+
+def dibujar_hud(renderer):
+    """HUD del perfilador sobre la escena (borra el anterior y marca el nuevo)."""
+    if PROF.hud_rect is not None:
+        renderer.clear(PROF.hud_rect)
+    rect = PROF.draw_hud(WIN, fuente("Courier", 16).font)
+    if rect is not None:
+        renderer.mark(rect)
+
+# ==================== VELOCIDAD (1-4) =====================
+TECLAS_VELOCIDAD = {pygame.K_1: 0, pygame.K_2: 1, pygame.K_3: 2, pygame.K_4: 3}
+
+def dibujar_velocidad(renderer, font, sched, y, anterior):
+    """Leyenda 'Velocidad: xN' centrada en 'y'; se redibuja solo si cambió.
+    'anterior' es (etiqueta, rect) del último dibujo; devuelve el nuevo par."""
+    etiqueta, rect = anterior
+    if etiqueta == sched.etiqueta:
+        return anterior
+    if rect is not None:
+        renderer.clear(rect)
+    txt, rect = font.render(f"Velocidad: {sched.etiqueta}  (1-4: x1 / x10 / x100 / máx)", WHITE)
+    rect.midtop = (WIDTH//2, y)
+    renderer.blit(txt, rect)
+    return sched.etiqueta, rect
+
+# ===================== CÁMARA (mapa) =====================
+VISTA_MAX = pygame.Rect(32, 80, WIDTH - 64, HEIGHT - 250)   # área del mapa si no cabe entero
+TECLAS_CAMARA = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+                 pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+PASO_CAMARA = 4     # celdas por pulsación de flecha
+ZOOM_PASO = 1.25
+
+def vista_mapa():
+    """Rect de pantalla del mapa: el mundo entero centrado si cabe a zoom 1; si no, VISTA_MAX."""
+    bw, bh = MUNDO_W*TILE, MUNDO_H*TILE
+    if bw <= VISTA_MAX.w and bh <= VISTA_MAX.h:
+        off_x, off_y = word.grid_screen_offset(WIDTH, HEIGHT, MUNDO_W, MUNDO_H, TILE)
+        return pygame.Rect(off_x, off_y, bw, bh)
+    return VISTA_MAX.copy()
+
+def manejar_camara(cam, key, celda):
+    """Flechas: desplazar | +/-: zoom | C: centrar y seguir al tanque. True si la vista cambió."""
+    if key in TECLAS_CAMARA:
+        dx, dy = TECLAS_CAMARA[key]
+        paso = PASO_CAMARA * cam.tile_px
+        return cam.desplazar(dx * paso, dy * paso)
+    if key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+        return cam.set_zoom(cam.zoom * ZOOM_PASO)
+    if key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+        return cam.set_zoom(cam.zoom / ZOOM_PASO)
+    if key == pygame.K_c and celda is not None:
+        cam.centrar(celda)
+        return True
+    return False
+
+def dibujar_tanque(agente, cam):
+    """Tanque al zoom de la cámara, recortado a la vista; devuelve el rect dibujado."""
+    off_x, off_y = cam.offset()
+    WIN.set_clip(cam.view)
+    rect = agente.draw(WIN, sprite_escalado(SPR_TANK, cam.tile_px), off_x, off_y, cam.tile_px)
+    WIN.set_clip(None)
+    return rect
+
+@functools.lru_cache(maxsize=64)
+def sprite_tanque(dir_, px):
+    """Sprite del tanque girado hacia 'dir_' (orden de competitive.DIRS) y escalado a 'px'."""
+    angulo = (-90, 90, 180, 0)[dir_]   # el PNG mira hacia arriba
+    return pygame.transform.rotate(sprite_escalado(SPR_TANK, px), angulo)
+
+# ============== NIVELES EN SEGUNDO PLANO (R) ===============
+PREFETCH = {}   # estrategia (None = solo generar) -> LevelPrefetcher
+
+def prefetcher(estrategia=None):
+    """Trabajador del modo; se conserva entre entradas para que su cola siga llena."""
+    pref = PREFETCH.get(estrategia)
+    if pref is None:
+        pref = PREFETCH[estrategia] = LevelPrefetcher(
+            MUNDO_W, MUNDO_H, {EMPTY, GRASS, WIN_C}, estrategia,
+            densidad_brick=0.30, densidad_grass=0.15, metodo="conexo")
+    return pref
+
+# ================= ESPERA DE EVENTOS (IDLE) ================
+# Ventana descubierta/restaurada: hay que repintar todo.
+EXPUESTA = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+def esperar_eventos(timeout_ms=None):
+    """
+    Bloquea hasta el próximo evento (o 'timeout_ms' si hay una animación
+    en curso) y devuelve todos los pendientes. Con la pantalla quieta el
+    proceso duerme en lugar de repintar a 60 fps.
+    """
+    e = pygame.event.wait(timeout_ms) if timeout_ms else pygame.event.wait()
+    eventos = [] if e.type == pygame.NOEVENT else [e]
+    eventos.extend(pygame.event.get())
+    return eventos
 
 # ======================== UI: BOTÓN =======================
 class Button:
@@ -54,7 +176,7 @@ class Button:
     def __init__(self, x, y, width, height, text, font_size=40):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.freetype.SysFont("Courier", font_size, bold=True)
+        self.font = fuente("Courier", font_size, bold=True)
         self.color = ORANGE
         self.hover = False
 
@@ -65,9 +187,14 @@ class Button:
         txt, r = self.font.render(self.text, WHITE)
         r.center = self.rect.center
         surface.blit(txt, r)
+        return self.rect
 
     def check_hover(self, mouse_pos):
-        self.hover = self.rect.collidepoint(mouse_pos)
+        """Actualiza 'hover'; devuelve True si cambió (hay que redibujar)."""
+        hover = bool(self.rect.collidepoint(mouse_pos))
+        changed = hover != self.hover
+        self.hover = hover
+        return changed
 
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
@@ -77,42 +204,47 @@ def submenu_agente():
     """
     Pantalla intermedia al hacer clic en 'Mode Agent'.
     - 'No informado' -> explora aleatoriamente hasta llegar al WIN
-    - 'Informado'    -> A* (ruta óptima)
+    - una opción por estrategia de search.ESTRATEGIAS (BFS, A*, ...):
+      calcula la ruta con ella y la sigue. Devuelve su nombre.
     ESC -> volver al menú principal.
     """
-    clock = pygame.time.Clock()
-    title_font = pygame.freetype.SysFont("Courier", 64, bold=True)
-    info_font  = pygame.freetype.SysFont("Courier", 22)
+    title_font = fuente("Courier", 64, bold=True)
+    info_font  = fuente("Courier", 22)
 
-    w, h = 420, 78
-    spacing = 22
+    opciones = [("uninformed", "No informado")] + search.estrategias()
+    w, h = 560, 64
+    spacing = 14
     cx = WIDTH // 2 - w // 2
-    cy = HEIGHT // 2 - (h*2 + spacing) // 2
+    cy = HEIGHT // 2 - (h*len(opciones) + spacing*(len(opciones) - 1)) // 2
 
-    btn_noinf = Button(cx, cy + 0*(h+spacing), w, h, "No informado")
-    btn_inf   = Button(cx, cy + 1*(h+spacing), w, h, "Informado")
+    botones = [(nombre, Button(cx, cy + k*(h+spacing), w, h, etiqueta, font_size=34))
+               for k, (nombre, etiqueta) in enumerate(opciones)]
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
 
     while True:
-        clock.tick(60)
+        # sin animaciones: dormir hasta que pase algo (salvo repintado pendiente)
+        eventos = pygame.event.get() if redraw else esperar_eventos()
         mouse = pygame.mouse.get_pos()
 
-        for e in pygame.event.get():
+        for e in eventos:
             if e.type == pygame.QUIT: return None
+            if e.type in EXPUESTA: redraw = True
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE: return "back"
             if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-                if btn_noinf.is_clicked(mouse): return "uninformed"
-                if btn_inf.is_clicked(mouse):   return "informed"
+                for nombre, b in botones:
+                    if b.is_clicked(mouse): return nombre
 
-        # fondo
-        if BG_IMG: WIN.blit(BG_IMG, (0,0))
-        else: WIN.fill(BLACK)
+        # fondo (solo al entrar); después, solo botones cuyo hover cambió
+        if redraw:
+            renderer.draw_background()
 
-        for b in (btn_noinf, btn_inf):
-            b.check_hover(mouse)
-            b.draw(WIN)
+        for _, b in botones:
+            if b.check_hover(mouse) or redraw:
+                renderer.mark(b.draw(WIN))
+        redraw = False
 
-
-        pygame.display.update()
+        renderer.present()
 
 # ===================== MODO: AGENTE (NO INF.) ==============
 def mode_agente():
@@ -121,160 +253,393 @@ def mode_agente():
     hasta llegar a WIN. R: nuevo mapa | ESC: volver al menú.
     """
     clock = pygame.time.Clock()
-    title_font = pygame.freetype.SysFont("Courier", 44, bold=True)
-    info_font  = pygame.freetype.SysFont("Courier", 22)
+    title_font = fuente("Courier", 44, bold=True)
+    info_font  = fuente("Courier", 22)
 
-    # 1) Generar nivel
-    grid, start, goal = word.generar_nivel(
-        GRID_W, GRID_H, EMPTY, GRASS, BRICK, TANK_C, WIN_C,
-        densidad_brick=0.30, densidad_grass=0.15, max_intentos=200
-    )
+    # 1) Nivel (el primero de la cola del trabajador; R pide el siguiente)
+    pref = prefetcher()
+    grid, start, goal, _, _ = pref.pedir().result()
+    pendiente = None
 
     # 2) Crear explorador aleatorio
     explorer = RandomExplorer(
         grid=grid, start=start, goal=goal,
-        grid_w=GRID_W, grid_h=GRID_H,
+        grid_w=MUNDO_W, grid_h=MUNDO_H,
         walkable={EMPTY, GRASS, WIN_C},
         step_ms=160
     )
+    mapa = ChunkedMapLayer(grid, MUNDO_W, MUNDO_H, TILE, DARK, SPR_GRASS, SPR_BRICK, SPR_WIN)
+    cam = Camera(vista_mapa(), MUNDO_W, MUNDO_H, TILE)
+    cam.centrar(start)
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
+    sched = FixedTimestep(step_ms=160)
+    velocidad = (None, None)
+    vista_movida = False
 
     while True:
         dt = clock.tick(60)
-        for e in pygame.event.get():
+        if explorer.finished and not redraw and not PROF.enabled and pendiente is None:
+            eventos = esperar_eventos()  # terminó: nada que animar hasta R/ESC
+            clock.tick()                 # el tiempo dormido no cuenta como dt
+        else:
+            eventos = pygame.event.get()
+        PROF.begin_frame()
+        for e in eventos:
             if e.type == pygame.QUIT: return False
+            if e.type in EXPUESTA: redraw = True
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE: return True
-                if e.key == pygame.K_r:
-                    grid, start, goal = word.generar_nivel(
-                        GRID_W, GRID_H, EMPTY, GRASS, BRICK, TANK_C, WIN_C,
-                        densidad_brick=0.30, densidad_grass=0.15, max_intentos=200
-                    )
-                    explorer = RandomExplorer(
-                        grid=grid, start=start, goal=goal,
-                        grid_w=GRID_W, grid_h=GRID_H,
-                        walkable={EMPTY, GRASS, WIN_C},
-                        step_ms=160
-                    )
-
-        # avanzar una celda (cuando acumula step_ms)
-        explorer.update(dt)
-
-        # dibujar escena
-        if BG_IMG: WIN.blit(BG_IMG, (0,0))
-        else: WIN.fill(BLACK)
-
-        title, tr = title_font.render("MODE AGENT — NO INFORMADO (Exploración aleatoria)", ORANGE)
-        tr.midtop = (WIDTH // 2, 18); WIN.blit(title, tr)
-
-        off_x, off_y = word.grid_screen_offset(WIDTH, HEIGHT, GRID_W, GRID_H, TILE)
-        word.dibujar_grid(WIN, grid, GRID_W, GRID_H, TILE, DARK,
-                          SPR_GRASS, SPR_BRICK, SPR_WIN, off_x, off_y)
-        explorer.draw(WIN, SPR_TANK, off_x, off_y, TILE)
-
-        # estado
-        legend_y = off_y + GRID_H*TILE + 12
-        tip, tipr = info_font.render("R: nuevo mapa | ESC: menú", WHITE)
-        tipr.midtop = (WIDTH//2, legend_y); WIN.blit(tip, tipr)
-
-        if explorer.finished and explorer.cell == goal:
+                if e.key == pygame.K_F3:
+                    PROF.toggle(); redraw = True
+                if e.key in TECLAS_VELOCIDAD:
+                    sched.set_speed(VELOCIDADES[TECLAS_VELOCIDAD[e.key]])
+                if manejar_camara(cam, e.key, explorer.cell):
+                    vista_movida = True
+                if e.key == pygame.K_r and pendiente is None:
+                    pendiente = pref.pedir()
+
+        # nivel nuevo listo (si estaba en la cola, en el mismo frame de la R)
+        if pendiente is not None and pendiente.done():
+            grid, start, goal, _, _ = pendiente.result()
+            pendiente = None
+            explorer = RandomExplorer(
+                grid=grid, start=start, goal=goal,
+                grid_w=MUNDO_W, grid_h=MUNDO_H,
+                walkable={EMPTY, GRASS, WIN_C},
+                step_ms=160
+            )
+            mapa.set_grid(grid)
+            cam.centrar(start)
+            sched.reset()
+            redraw = True
+
+        PROF.mark("eventos")
+
+        # avanzar las celdas que tocan (paso fijo x multiplicador)
+        sched.advance(dt, explorer.step, lambda: explorer.finished)
+        if cam.seguir(explorer.cell):
+            vista_movida = True
+        PROF.mark("update")
+
+        # dibujar escena: completa al entrar o con mapa nuevo; la vista del
+        # mapa si la cámara se movió; si no, solo la celda que deja el
+        # tanque y la que ocupa
+        legend_y = cam.view.bottom + 12
+        if redraw:
+            renderer.draw_background()
+
+            title, tr = title_font.render("MODE AGENT — NO INFORMADO (Exploración aleatoria)", ORANGE)
+            tr.midtop = (WIDTH // 2, 18); WIN.blit(title, tr)
+            PROF.mark("texto")
+
+            mapa.draw(WIN, cam)
+            dibujar_tanque(explorer, cam)
+            PROF.mark("mapa")
+
+            # estado
+            tip, tipr = info_font.render("R: nuevo mapa | flechas, +/-, C: cámara | ESC: menú", WHITE)
+            tipr.midtop = (WIDTH//2, legend_y); WIN.blit(tip, tipr)
+
+            prev_cell = explorer.cell
+            done_shown = False
+            velocidad = (None, None)
+            redraw = False
+        elif vista_movida:
+            renderer.clear(cam.view)
+            mapa.draw(WIN, cam)
+            dibujar_tanque(explorer, cam)
+            prev_cell = explorer.cell
+        elif explorer.cell != prev_cell:
+            renderer.mark(mapa.draw_cell(WIN, cam, *prev_cell))
+            renderer.mark(dibujar_tanque(explorer, cam))
+            prev_cell = explorer.cell
+        vista_movida = False
+        PROF.mark("mapa")
+
+        if explorer.finished and explorer.cell == goal and not done_shown:
             done, dr = info_font.render("¡Objetivo alcanzado!", ORANGE)
-            dr.midtop = (WIDTH//2, legend_y + 26); WIN.blit(done, dr)
+            dr.midtop = (WIDTH//2, legend_y + 26); renderer.blit(done, dr)
+            done_shown = True
+        velocidad = dibujar_velocidad(renderer, info_font, sched, legend_y + 52, velocidad)
+        PROF.mark("texto")
 
-        pygame.display.update()
+        dibujar_hud(renderer)
+        PROF.mark("hud")
+        renderer.present()
+        PROF.mark("display")
+        PROF.end_frame()
 
 # ===================== MODO: AGENTE (INFORMADO) =============
-def mode_agente_informado():
+def mode_agente_informado(algoritmo="astar"):
     """
-    Modo INFORMADO: calcula ruta óptima con A* (heurística Manhattan)
-    y anima al tanque siguiéndola. R: nuevo mapa | ESC: volver al menú.
+    Modo INFORMADO: calcula la ruta con la estrategia 'algoritmo' de
+    search.py (A* por defecto) y anima al tanque siguiéndola; muestra las
+    estadísticas de la búsqueda. R: nuevo mapa | ESC: volver al menú.
     """
+    estrategia = search.ESTRATEGIAS[algoritmo]
     clock = pygame.time.Clock()
-    title_font = pygame.freetype.SysFont("Courier", 44, bold=True)
-    info_font  = pygame.freetype.SysFont("Courier", 22)
-
-    # 1) Generar nivel
-    grid, start, goal = word.generar_nivel(
-        GRID_W, GRID_H, EMPTY, GRASS, BRICK, TANK_C, WIN_C,
-        densidad_brick=0.30, densidad_grass=0.15, max_intentos=200
-    )
-
-    # 2) Calcular ruta con A* y crear seguidor
-    ruta = a_star_camino(grid, start, goal, GRID_W, GRID_H, {EMPTY, GRASS, WIN_C})
-    follower = RouteFollower(ruta, step_ms=160)
+    title_font = fuente("Courier", 44, bold=True)
+    info_font  = fuente("Courier", 22)
+
+    # 1) Nivel + ruta con la estrategia elegida, ya calculados por el
+    #    trabajador en segundo plano (R pide el siguiente de la cola)
+    pref = prefetcher(algoritmo)
+    grid, start, goal, ruta, stats = pref.pedir().result()
+    pendiente = None
+
+    # 2) Crear seguidor
+    follower = RouteFollower(ruta, step_ms=160, tiempo_celda=tiempo_terreno(grid))  # hierba: más lenta
+    mapa = ChunkedMapLayer(grid, MUNDO_W, MUNDO_H, TILE, DARK, SPR_GRASS, SPR_BRICK, SPR_WIN)
+    cam = Camera(vista_mapa(), MUNDO_W, MUNDO_H, TILE)
+    cam.centrar(start)
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
+    sched = FixedTimestep(step_ms=160)
+    velocidad = (None, None)
+    vista_movida = False
 
     while True:
         dt = clock.tick(60)
-        for e in pygame.event.get():
+        if follower.detenido and not redraw and not PROF.enabled and pendiente is None:
+            eventos = esperar_eventos()  # terminó (o sin ruta): nada que animar hasta R/ESC
+            clock.tick()                 # el tiempo dormido no cuenta como dt
+        else:
+            eventos = pygame.event.get()
+        PROF.begin_frame()
+        for e in eventos:
             if e.type == pygame.QUIT: return False
+            if e.type in EXPUESTA: redraw = True
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE: return True
-                if e.key == pygame.K_r:
-                    grid, start, goal = word.generar_nivel(
-                        GRID_W, GRID_H, EMPTY, GRASS, BRICK, TANK_C, WIN_C,
-                        densidad_brick=0.30, densidad_grass=0.15, max_intentos=200
-                    )
-                    ruta = a_star_camino(grid, start, goal, GRID_W, GRID_H, {EMPTY, GRASS, WIN_C})
-                    follower.reset(ruta)
-
-        # avanzar por la ruta (si existe)
-        follower.update(dt)
-
-        # dibujar escena
-        if BG_IMG: WIN.blit(BG_IMG, (0,0))
-        else: WIN.fill(BLACK)
-
-        title, tr = title_font.render("MODE AGENT — INFORMADO (A*)  |  R: nuevo mapa  |  ESC: menú", ORANGE)
-        tr.midtop = (WIDTH // 2, 18); WIN.blit(title, tr)
-
-        off_x, off_y = word.grid_screen_offset(WIDTH, HEIGHT, GRID_W, GRID_H, TILE)
-        word.dibujar_grid(WIN, grid, GRID_W, GRID_H, TILE, DARK,
-                          SPR_GRASS, SPR_BRICK, SPR_WIN, off_x, off_y)
-        follower.draw(WIN, SPR_TANK, off_x, off_y, TILE)
-
-        legend_y = off_y + GRID_H*TILE + 12
-        if not follower.ruta:
-            msg, mr = info_font.render("Sin ruta (A* no encontró camino). Pulsa R para regenerar.", WHITE)
-            mr.midtop = (WIDTH//2, legend_y)
-            WIN.blit(msg, mr)
-        else:
-            tip, tipr = info_font.render(f"Longitud ruta: {len(follower.ruta)} celdas", WHITE)
-            tipr.midtop = (WIDTH//2, legend_y)
-            WIN.blit(tip, tipr)
-            if follower.finished and follower.cell == follower.ruta[-1] == goal:
-                done, dr = info_font.render("¡Objetivo alcanzado por A*!", ORANGE)
-                dr.midtop = (WIDTH//2, legend_y + 26); WIN.blit(done, dr)
+                if e.key == pygame.K_F3:
+                    PROF.toggle(); redraw = True
+                if e.key in TECLAS_VELOCIDAD:
+                    sched.set_speed(VELOCIDADES[TECLAS_VELOCIDAD[e.key]])
+                if manejar_camara(cam, e.key, follower.cell):
+                    vista_movida = True
+                if e.key == pygame.K_r and pendiente is None:
+                    pendiente = pref.pedir()
+
+        # nivel + ruta listos (si estaban en la cola, en el mismo frame de la R)
+        if pendiente is not None and pendiente.done():
+            grid, start, goal, ruta, stats = pendiente.result()
+            pendiente = None
+            follower.reset(ruta, tiempo_celda=tiempo_terreno(grid))
+            mapa.set_grid(grid)
+            cam.centrar(start)
+            sched.reset()
+            redraw = True
+
+        PROF.mark("eventos")
+
+        # avanzar por la ruta (si existe), con paso fijo x multiplicador
+        sched.advance(dt, follower.step, lambda: follower.detenido)
+        if cam.seguir(follower.cell):
+            vista_movida = True
+        PROF.mark("update")
+
+        # dibujar escena: completa al entrar o con mapa nuevo; la vista del
+        # mapa si la cámara se movió; si no, solo la celda que deja el
+        # tanque y la que ocupa
+        legend_y = cam.view.bottom + 12
+        if redraw:
+            renderer.draw_background()
+
+            title, tr = title_font.render(f"MODE AGENT — INFORMADO ({estrategia.etiqueta})", ORANGE)
+            tr.midtop = (WIDTH // 2, 18); WIN.blit(title, tr)
+            PROF.mark("texto")
+
+            mapa.draw(WIN, cam)
+            dibujar_tanque(follower, cam)
+            PROF.mark("mapa")
+
+            if not follower.ruta:
+                msg, mr = info_font.render(f"Sin ruta ({estrategia.etiqueta} no encontró camino). Pulsa R para regenerar.", WHITE)
+                mr.midtop = (WIDTH//2, legend_y)
+                WIN.blit(msg, mr)
+            else:
+                tip, tipr = info_font.render(
+                    f"Ruta: {len(follower.ruta)} celdas, costo {costo_ruta(grid, follower.ruta)} | expandidos: {stats.expandidos} | "
+                    f"pushes: {stats.pushes} | pico frontera: {stats.pico_frontera} | "
+                    f"{stats.ns/1e6:.2f} ms", WHITE)
+                tipr.midtop = (WIDTH//2, legend_y)
+                WIN.blit(tip, tipr)
+            keys, kr = info_font.render("R: nuevo mapa | flechas, +/-, C: cámara | ESC: menú", WHITE)
+            kr.midtop = (WIDTH//2, legend_y + 78); WIN.blit(keys, kr)
+
+            prev_cell = follower.cell
+            done_shown = False
+            velocidad = (None, None)
+            redraw = False
+        elif vista_movida:
+            renderer.clear(cam.view)
+            mapa.draw(WIN, cam)
+            dibujar_tanque(follower, cam)
+            prev_cell = follower.cell
+        elif follower.cell != prev_cell:
+            renderer.mark(mapa.draw_cell(WIN, cam, *prev_cell))
+            renderer.mark(dibujar_tanque(follower, cam))
+            prev_cell = follower.cell
+        vista_movida = False
+        PROF.mark("mapa")
+
+        if (follower.ruta and not done_shown and
+                follower.finished and follower.cell == follower.ruta[-1] == goal):
+            done, dr = info_font.render(f"¡Objetivo alcanzado por {estrategia.etiqueta}!", ORANGE)
+            dr.midtop = (WIDTH//2, legend_y + 26); renderer.blit(done, dr)
+            done_shown = True
+        velocidad = dibujar_velocidad(renderer, info_font, sched, legend_y + 52, velocidad)
+        PROF.mark("texto")
+
+        dibujar_hud(renderer)
+        PROF.mark("hud")
+        renderer.present()
+        PROF.mark("display")
+        PROF.end_frame()
+
+# ======================= COMPETITIVE ========================
+N_TANQUES = 120
+PASO_TANQUES = 20   # N / M: agregar / quitar tanques
+
+def mode_competitivo():
+    """
+    Modo COMPETITIVE: N_TANQUES tanques que deambulan y disparan sobre el
+    mismo mapa; las balas rompen ladrillos o reaparecen al tanque que tocan.
+    R: nuevo mapa | N / M: más / menos tanques | ESC: volver al menú.
+    """
+    clock = pygame.time.Clock()
+    title_font = fuente("Courier", 44, bold=True)
+    info_font  = fuente("Courier", 22)
+
+    pref = prefetcher()
+    pendiente = None
+
+    def nueva_arena(nivel, n):
+        grid, start, _, _, _ = nivel
+        grid.set(*start, EMPTY)   # aquí no hay tanque inicial: la celda queda libre
+        return Arena(grid, MUNDO_W, MUNDO_H, TILE, n)
+
+    arena = nueva_arena(pref.pedir().result(), N_TANQUES)
+    mapa = ChunkedMapLayer(arena.grid, MUNDO_W, MUNDO_H, TILE, DARK, SPR_GRASS, SPR_BRICK, SPR_WIN)
+    cam = Camera(vista_mapa(), MUNDO_W, MUNDO_H, TILE)
+    cam.centrar((MUNDO_W // 2, MUNDO_H // 2))
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
+    sched = FixedTimestep(step_ms=16, max_pasos_frame=8)
+    estado_rect = None
+    estado_ms = 0
 
-        pygame.display.update()
+    while True:
+        dt = clock.tick(60)
+        eventos = pygame.event.get()
+        PROF.begin_frame()
+        for e in eventos:
+            if e.type == pygame.QUIT: return False
+            if e.type in EXPUESTA: redraw = True
+            if e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_ESCAPE: return True
+                if e.key == pygame.K_F3:
+                    PROF.toggle(); redraw = True
+                if e.key == pygame.K_n:
+                    arena.agregar_tanques(PASO_TANQUES)
+                if e.key == pygame.K_m:
+                    arena.quitar_tanques(PASO_TANQUES)
+                manejar_camara(cam, e.key, None)
+                if e.key == pygame.K_r and pendiente is None:
+                    pendiente = pref.pedir()
+
+        if pendiente is not None and pendiente.done():
+            arena = nueva_arena(pendiente.result(), len(arena.tanques))
+            pendiente = None
+            mapa.set_grid(arena.grid)
+            sched.reset()
+            redraw = True
+        PROF.mark("eventos")
+
+        sched.advance(dt, lambda: arena.step(sched.step_ms / 1000))
+        for x, y in arena.cambios:          # ladrillos rotos: rehacer su chunk
+            mapa.invalidate_cell(x, y)
+        arena.cambios.clear()
+        PROF.mark("update")
+
+        legend_y = cam.view.bottom + 12
+        if redraw:
+            renderer.draw_background()
+            title, tr = title_font.render("COMPETITIVE", ORANGE)
+            tr.midtop = (WIDTH // 2, 18); WIN.blit(title, tr)
+            keys, kr = info_font.render("R: nuevo mapa | N / M: +/- tanques | flechas, +/-: cámara | ESC: menú", WHITE)
+            kr.midtop = (WIDTH//2, legend_y + 26); WIN.blit(keys, kr)
+            estado_rect = None
+            redraw = False
+            PROF.mark("texto")
+
+        # todo se mueve cada frame: se redibuja la vista entera (chunks cacheados)
+        renderer.clear(cam.view)
+        mapa.draw(WIN, cam)
+        off_x, off_y = cam.offset()
+        escala = cam.tile_px / TILE
+        px = max(1, round(arena.lado * escala))
+        WIN.set_clip(cam.view)
+        for tq in arena.tanques:
+            WIN.blit(sprite_tanque(tq.dir, px), (off_x + tq.rect.x*escala, off_y + tq.rect.y*escala))
+        lb = max(2, round(4 * escala))
+        for b in arena.balas:
+            WIN.fill(ORANGE, (off_x + b.x*escala - lb//2, off_y + b.y*escala - lb//2, lb, lb))
+        WIN.set_clip(None)
+        PROF.mark("mapa")
+
+        # estado (4 veces por segundo: legible y sin llenar la caché de textos)
+        estado_ms -= dt
+        if estado_ms <= 0 or estado_rect is None:
+            estado_ms = 250
+            if estado_rect is not None:
+                renderer.clear(estado_rect)
+            txt, estado_rect = info_font.render(
+                f"Tanques: {len(arena.tanques)} | balas: {len(arena.balas)} | "
+                f"ladrillos rotos: {arena.ladrillos_rotos} | impactos: {arena.impactos} | "
+                f"paso: {arena.ns_paso/1e6:.2f} ms", WHITE)
+            estado_rect.midtop = (WIDTH//2, legend_y)
+            renderer.blit(txt, estado_rect)
+        PROF.mark("texto")
+
+        dibujar_hud(renderer)
+        PROF.mark("hud")
+        renderer.present()
+        PROF.mark("display")
+        PROF.end_frame()
 
 # ========================= PLACEHOLDER ======================
 def placeholder_mode(texto):
     """Pantalla temporal para modos sin implementar (ESC vuelve)."""
-    clock = pygame.time.Clock()
-    title_font = pygame.freetype.SysFont("Courier", 44, bold=True)
-    info_font  = pygame.freetype.SysFont("Courier", 22)
+    title_font = fuente("Courier", 44, bold=True)
+    info_font  = fuente("Courier", 22)
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
     while True:
-        clock.tick(60)
-        for e in pygame.event.get():
+        for e in (pygame.event.get() if redraw else esperar_eventos()):
             if e.type == pygame.QUIT: return False
+            if e.type in EXPUESTA: redraw = True
             if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE: return True
 
-        if BG_IMG: WIN.blit(BG_IMG,(0,0))
-        else: WIN.fill(BLACK)
+        # pantalla estática: se dibuja una vez y luego no hay nada sucio
+        if redraw:
+            renderer.draw_background()
 
-        t, r = title_font.render(texto, ORANGE); r.center = (WIDTH//2, HEIGHT//2)
-        WIN.blit(t, r)
-        tip, tr = info_font.render("ESC para volver al menú", WHITE)
-        tr.midtop = (WIDTH//2, r.bottom + 18); WIN.blit(tip, tr)
+            t, r = title_font.render(texto, ORANGE); r.center = (WIDTH//2, HEIGHT//2)
+            WIN.blit(t, r)
+            tip, tr = info_font.render("ESC para volver al menú", WHITE)
+            tr.midtop = (WIDTH//2, r.bottom + 18); WIN.blit(tip, tr)
+            redraw = False
 
-        pygame.display.update()
+        renderer.present()
 
 # =========================== MENÚ ===========================
 def menu():
     """
     Menú principal. Textos originales: 'Mode Agent', 'Mode User', 'COMPETITIVE'.
     """
-    clock = pygame.time.Clock()
-    title_font = pygame.freetype.SysFont("Courier", 72, bold=True)
+    title_font = fuente("Courier", 72, bold=True)
 
     # Botones centrados
     w, h = 420, 78
@@ -285,23 +650,29 @@ def menu():
     btn_agent = Button(cx, cy + 0*(h+spacing), w, h, "Mode Agent")
     btn_user  = Button(cx, cy + 1*(h+spacing), w, h, "Mode User")
     btn_comp  = Button(cx, cy + 2*(h+spacing), w, h, "COMPETITIVE")
+    renderer = DirtyRenderer(WIN, fondo(), BLACK)
+    redraw = True
 
     while True:
-        clock.tick(60)
+        # sin animaciones: dormir hasta que pase algo (salvo repintado pendiente)
+        eventos = pygame.event.get() if redraw else esperar_eventos()
         mouse = pygame.mouse.get_pos()
-        for e in pygame.event.get():
+        for e in eventos:
             if e.type == pygame.QUIT: return None
+            if e.type in EXPUESTA: redraw = True
             if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
                 if btn_agent.is_clicked(mouse): return "agent"
                 if btn_user.is_clicked(mouse):  return "user"
                 if btn_comp.is_clicked(mouse):  return "competitive"
 
-        if BG_IMG: WIN.blit(BG_IMG,(0,0))
-        else: WIN.fill(BLACK)
+        if redraw:
+            renderer.draw_background()
 
         for b in (btn_agent, btn_user, btn_comp):
-            b.check_hover(mouse); b.draw(WIN)
-        pygame.display.update()
+            if b.check_hover(mouse) or redraw:
+                renderer.mark(b.draw(WIN))
+        redraw = False
+        renderer.present()
 
 # ============================ MAIN ==========================
 def main():
@@ -315,14 +686,17 @@ def main():
             if choice == "back": continue
             if choice == "uninformed":
                 if mode_agente() is False: break
-            elif choice == "informed":
-                if mode_agente_informado() is False: break
+            elif choice in search.ESTRATEGIAS:
+                if mode_agente_informado(choice) is False: break
 
         elif opt == "user":
             if placeholder_mode("MODE USER (en construcción)") is False: break
         elif opt == "competitive":
-            if placeholder_mode("COMPETITIVE (en construcción)") is False: break
+            if mode_competitivo() is False: break
 
+    PROF.close()  # vuelca el CSV de frames (si el perfilador se activó)
+    for pref in PREFETCH.values():
+        pref.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,85 @@
+# prefetch.py
+# Generación de niveles y planificación en segundo plano: un hilo trabajador
+# prepara tuplas (grid, start, goal, ruta, stats) y mantiene una pequeña
+# cola de niveles listos, así el bucle del juego no se congela al pulsar R.
+# El bucle pide un Future con pedir() y lo consulta en cada frame con done().
+#
+# Se usa un hilo (no procesos): main.py abre la ventana al importarse, así
+# que un pool de procesos "spawn" la abriría otra vez en cada hijo; y el
+# hilo principal pasa la mayor parte del frame dormido en clock.tick().
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import word
+import search
+from agent import RUTAS_CACHE
+
+def generar_y_planificar(grid_w: int, grid_h: int, walkable: set, estrategia=None,
+                         seed=None, densidad_brick: float = 0.30, densidad_grass: float = 0.15,
+                         metodo: str = "conexo"):
+    """
+    Genera un nivel y, si 'estrategia' (nombre de search.ESTRATEGIAS) no es
+    None, calcula su ruta a través de agent.RUTAS_CACHE (un nivel repetido
+    no se vuelve a planificar). Devuelve (grid, start, goal, ruta, stats);
+    sin estrategia, ruta y stats son None.
+    """
+    if seed is not None:
+        random.seed(seed)
+    grid, start, goal = word.generar_nivel(
+        grid_w, grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+        densidad_brick=densidad_brick, densidad_grass=densidad_grass,
+        como_grid=True, metodo=metodo)
+    if estrategia is None:
+        return grid, start, goal, None, None
+    ruta, stats = RUTAS_CACHE.buscar(grid, start, goal, grid_w, grid_h, walkable,
+                                     planner=search.obtener(estrategia).fn)
+    return grid, start, goal, ruta, stats
+
+class LevelPrefetcher:
+    """
+    Cola de 'profundidad' niveles en preparación / listos.
+    - pedir(): Future del próximo nivel (el más antiguo de la cola) y
+      encarga otro para reponerla.
+    - listos: cuántos de la cola ya terminaron (para HUD / pruebas).
+    - close(): cancela lo pendiente y libera el hilo.
+    """
+    def __init__(self, grid_w: int, grid_h: int, walkable: set, estrategia=None,
+                 profundidad: int = 2, **gen_kwargs):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.walkable = frozenset(walkable)
+        self.estrategia = estrategia
+        self.profundidad = max(1, profundidad)
+        self.gen_kwargs = gen_kwargs
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._cola = deque()
+        self._reponer()
+
+    def _reponer(self):
+        while len(self._cola) < self.profundidad:
+            self._cola.append(self._pool.submit(
+                generar_y_planificar, self.grid_w, self.grid_h, self.walkable,
+                self.estrategia, **self.gen_kwargs))
+
+    @property
+    def listos(self) -> int:
+        return sum(1 for f in self._cola if f.done())
+
+    def pedir(self):
+        """Future con (grid, start, goal, ruta, stats); si ya está hecho, se usa en este frame."""
+        fut = self._cola.popleft()
+        self._reponer()
+        return fut
+
+    def close(self):
+        for f in self._cola:
+            f.cancel()
+        self._cola.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,130 @@
+# profiler.py
+# Perfilador de frames opcional: mide cada etapa del bucle (eventos,
+# update, mapa, texto, hud, display) con perf_counter_ns, guarda las
+# últimas N muestras en un buffer circular, dibuja un HUD con p50/p95/p99
+# y vuelca cada frame a CSV. Se activa con TANK_PROFILE=1 o con F3.
+# Desactivado, cada marca es una llamada que retorna de inmediato.
+import csv
+import os
+from array import array
+from time import perf_counter_ns
+
+import pygame
+
+ETAPAS = ("eventos", "update", "mapa", "texto", "hud", "display")
+
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0
+    k = min(len(ordenados) - 1, int(round(p / 100.0 * (len(ordenados) - 1))))
+    return ordenados[k]
+
+class FrameProfiler:
+    """
+    Uso por frame:
+        prof.begin_frame()
+        ...; prof.mark("eventos")
+        ...; prof.mark("update")
+        ...
+        prof.end_frame()
+    mark(etapa) asigna a 'etapa' el tiempo transcurrido desde la marca anterior.
+    """
+    def __init__(self, enabled=False, capacidad=600, csv_path=None, etapas=ETAPAS):
+        self.enabled = enabled
+        self.capacidad = capacidad
+        self.csv_path = csv_path
+        self.etapas = etapas
+        self._col = {e: k for k, e in enumerate(etapas)}
+        self._ring = [array("q", [0]) * capacidad for _ in etapas]
+        self._total = array("q", [0]) * capacidad
+        self._actual = array("q", [0]) * len(etapas)
+        self._n = 0                # frames registrados (total)
+        self._t0 = self._last = 0
+        self._csv = self._writer = None
+        self._hud = None           # (superficie, rect) del último HUD
+        self.hud_rect = None
+
+    @classmethod
+    def desde_entorno(cls):
+        """TANK_PROFILE=1 lo activa; TANK_PROFILE_CSV elige el archivo de salida."""
+        return cls(enabled=os.environ.get("TANK_PROFILE", "") not in ("", "0"),
+                   csv_path=os.environ.get("TANK_PROFILE_CSV", "perfil_frames.csv"))
+
+    def toggle(self):
+        """Activa/desactiva; el frame en curso queda fuera (end_frame lo salta)."""
+        self.enabled = not self.enabled
+        self._hud = None
+        self._t0 = 0
+
+    # ---------------- medición ----------------
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._t0 = self._last = perf_counter_ns()
+        for k in range(len(self._actual)):
+            self._actual[k] = 0
+
+    def mark(self, etapa):
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self._actual[self._col[etapa]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled or not self._t0:
+            return
+        slot = self._n % self.capacidad
+        for k, ring in enumerate(self._ring):
+            ring[slot] = self._actual[k]
+        self._total[slot] = self._last - self._t0
+        self._n += 1
+        if self.csv_path:
+            self._escribir_csv()
+
+    def _escribir_csv(self):
+        if self._writer is None:
+            self._csv = open(self.csv_path, "w", newline="")
+            self._writer = csv.writer(self._csv)
+            self._writer.writerow(("frame",) + tuple(f"{e}_ns" for e in self.etapas) + ("total_ns",))
+        slot = (self._n - 1) % self.capacidad
+        self._writer.writerow((self._n - 1, *self._actual, self._total[slot]))
+
+    def close(self):
+        if self._csv is not None:
+            self._csv.close()
+            self._csv = self._writer = None
+
+    # ---------------- estadísticas ----------------
+    def percentiles(self, etapa=None, ps=(50, 95, 99)):
+        """Percentiles (ns) de las últimas 'capacidad' muestras de 'etapa' (None = total)."""
+        ring = self._total if etapa is None else self._ring[self._col[etapa]]
+        n = min(self._n, self.capacidad)
+        ordenados = sorted(ring[:n])
+        return tuple(_percentil(ordenados, p) for p in ps)
+
+    # ---------------- HUD ----------------
+    def draw_hud(self, surface, font, pos=(10, 10), cada=15):
+        """
+        Dibuja la tabla p50/p95/p99 (ms) por etapa. El texto se rehace cada
+        'cada' frames; devuelve el rect dibujado (None si está desactivado).
+        Desactivado deja hud_rect en None: quien lo borra lo hace una sola vez.
+        'font' es un pygame.freetype.Font.
+        """
+        if not self.enabled:
+            self.hud_rect = None
+            return None
+        if self._hud is None or self._n % cada == 0:
+            filas = [f"{'etapa':<8} {'p50':>6} {'p95':>6} {'p99':>6}  ms"]
+            for e in self.etapas + (None,):
+                p50, p95, p99 = self.percentiles(e)
+                filas.append(f"{e or 'total':<8} {p50/1e6:6.2f} {p95/1e6:6.2f} {p99/1e6:6.2f}")
+            alto = font.get_sized_height() + 2
+            ancho = max(font.get_rect(f).width for f in filas) + 12
+            hud = pygame.Surface((ancho, alto * len(filas) + 8))
+            hud.fill((10, 10, 10))
+            for k, f in enumerate(filas):
+                font.render_to(hud, (6, 4 + k*alto), f, (120, 230, 120))
+            self._hud = hud
+        self.hud_rect = surface.blit(self._hud, pos)
+        return self.hud_rect
@@ -0,0 +1,104 @@
+# render.py
+# Render por rectángulos sucios: en vez de repintar los 1920x1080 y llamar
+# a pygame.display.update() sobre toda la pantalla, cada bucle repinta solo
+# lo que cambió (tanque, hover de botones, textos de estado) y se envían a
+# la pantalla únicamente esas regiones.
+# También: registro de fuentes (un SysFont por familia/tamaño) y caché LRU
+# de textos ya rasterizados.
+import functools
+from collections import OrderedDict
+
+import pygame
+import pygame.freetype
+
+class DirtyRenderer:
+    """
+    Acumula las regiones modificadas de 'surface' durante un frame.
+    - invalidate(): el próximo present() actualiza la pantalla completa
+      (entrada a un bucle, nuevo mapa...).
+    - clear(rect): restaura el fondo bajo 'rect' y lo marca sucio.
+    - blit(src, dest): dibuja y marca sucia el área resultante.
+    - present(): llama a pygame.display.update solo con lo marcado.
+    """
+    def __init__(self, surface, background=None, fill_color=(0, 0, 0)):
+        self.surface = surface
+        self.background = background
+        self.fill_color = fill_color
+        self._dirty = []
+        self._full = True
+
+    def invalidate(self):
+        self._full = True
+        self._dirty.clear()
+
+    def mark(self, rect):
+        if not self._full:
+            self._dirty.append(pygame.Rect(rect))
+
+    def draw_background(self):
+        """Repinta el fondo completo (implica invalidate)."""
+        if self.background: self.surface.blit(self.background, (0, 0))
+        else: self.surface.fill(self.fill_color)
+        self.invalidate()
+
+    def clear(self, rect):
+        rect = pygame.Rect(rect)
+        if self.background: self.surface.blit(self.background, rect, rect)
+        else: self.surface.fill(self.fill_color, rect)
+        self.mark(rect)
+
+    def blit(self, src, dest):
+        rect = self.surface.blit(src, dest)
+        self.mark(rect)
+        return rect
+
+    def present(self):
+        if self._full:
+            pygame.display.update()
+            self._full = False
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+        self._dirty.clear()
+
+# ---------------- fuentes y textos cacheados ----------------
+class TextCache:
+    """
+    LRU de superficies de texto ya rasterizadas, por (fuente, texto, color).
+    Los títulos y leyendas fijas se renderizan una sola vez por proceso.
+    """
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._textos = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, spec, text, color):
+        key = (spec, text, tuple(color))
+        hit = self._textos.get(key)
+        if hit is not None:
+            self._textos.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            hit = font.render(text, color)
+            self._textos[key] = hit
+            if len(self._textos) > self.maxsize:
+                self._textos.popitem(last=False)
+        surf, rect = hit
+        return surf, rect.copy()  # el rect se modifica al posicionar (midtop, center...)
+
+TEXTOS = TextCache()
+
+class CachedFont:
+    """Fuente freetype cuyo render() pasa por TEXTOS (misma firma: texto, color)."""
+    def __init__(self, font, spec):
+        self.font = font
+        self.spec = spec
+
+    def render(self, text, color):
+        return TEXTOS.render(self.font, self.spec, text, color)
+
+@functools.lru_cache(maxsize=None)
+def fuente(family: str, size: int, bold: bool = False) -> CachedFont:
+    """SysFont resuelto una sola vez por proceso para cada (family, size, bold)."""
+    return CachedFont(pygame.freetype.SysFont(family, size, bold=bold), (family, size, bold))
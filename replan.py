@@ -0,0 +1,169 @@
+# replan.py
+# Replanificación incremental (D* Lite) para mapas que cambian: cuando una
+# celda pasa a ser (o deja de ser) caminable, solo se repara la parte de la
+# búsqueda afectada en lugar de lanzar a_star_camino desde cero.
+from heapq import heappush, heappop
+
+from grid import Grid
+
+INF = float("inf")
+
+class DStarLite:
+    """
+    Planificador D* Lite (Koenig & Likhachev) sobre el mismo grid y
+    conjunto 'walkable' que a_star_camino (4-conexo, costo 1 por paso).
+    - path(): ruta (lista de celdas) desde la posición actual hasta 'goal'.
+    - next_step(current): siguiente celda desde 'current' (None si no hay ruta).
+    - notify_cell_changed(x, y): relee la celda del grid y repara la búsqueda.
+    - move_to(cell): el agente avanzó; actualiza el start sin replanificar.
+    'version' se incrementa cada vez que un cambio del mapa puede alterar la
+    ruta, para que RouteFollower sepa cuándo cambiar su tramo restante.
+    """
+    def __init__(self, grid, start, goal, grid_w, grid_h, walkable: set):
+        self.grid = grid
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.walkable = walkable
+
+        w = grid_w
+        if isinstance(grid, Grid):
+            self.walk = bytearray(grid.walk_bytes(walkable))
+        else:
+            self.walk = bytearray(1 if c in walkable else 0 for fila in grid for c in fila)
+        self.start = start[1]*w + start[0]
+        self.goal = goal[1]*w + goal[0]
+
+        self.version = 0
+        self.expansiones = 0       # nodos expandidos (acumulado)
+        self._km = 0
+        self._last = self.start
+        self._g = {}
+        self._rhs = {self.goal: 0}
+        self._heap = []
+        self._en_cola = {}         # nodo -> clave vigente (entradas viejas se ignoran)
+        self._push(self.goal)
+
+    # ---------------- utilidades ----------------
+    def _h(self, a, b):
+        w = self.grid_w
+        return abs(a % w - b % w) + abs(a // w - b // w)
+
+    def _vecinos(self, i):
+        w, n = self.grid_w, self.grid_w * self.grid_h
+        x = i % w
+        if x + 1 < w: yield i + 1
+        if x > 0:     yield i - 1
+        if i + w < n: yield i + w
+        if i - w >= 0: yield i - w
+
+    def _costo(self, a, b):
+        # solo importa la celda destino: así el start (TANK_C) puede salir
+        # aunque no sea 'walkable', igual que en a_star_camino
+        return 1 if self.walk[b] else INF
+
+    def _key(self, s):
+        m = min(self._g.get(s, INF), self._rhs.get(s, INF))
+        return (m + self._h(self.start, s) + self._km, m)
+
+    def _push(self, s):
+        k = self._key(s)
+        self._en_cola[s] = k
+        heappush(self._heap, (k, s))
+
+    def _top_key(self):
+        heap = self._heap
+        while heap and self._en_cola.get(heap[0][1]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0] if heap else (INF, INF)
+
+    # ---------------- núcleo D* Lite ----------------
+    def _update_vertex(self, u):
+        if u != self.goal:
+            best = INF
+            g, walk = self._g, self.walk
+            for s in self._vecinos(u):
+                if walk[s]:
+                    c = 1 + g.get(s, INF)
+                    if c < best: best = c
+            self._rhs[u] = best
+        self._en_cola.pop(u, None)
+        if self._g.get(u, INF) != self._rhs.get(u, INF):
+            self._push(u)
+
+    def _compute(self):
+        g, rhs = self._g, self._rhs
+        while (self._top_key() < self._key(self.start)
+               or rhs.get(self.start, INF) != g.get(self.start, INF)):
+            if not self._heap:
+                break
+            k_old, u = heappop(self._heap)
+            del self._en_cola[u]
+            self.expansiones += 1
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for s in self._vecinos(u):
+                    self._update_vertex(s)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for s in self._vecinos(u):
+                    self._update_vertex(s)
+
+    # ---------------- API ----------------
+    def move_to(self, cell):
+        self.start = cell[1]*self.grid_w + cell[0]
+
+    def notify_cell_changed(self, x: int, y: int):
+        """La celda (x, y) del grid cambió: repara solo lo afectado."""
+        i = y*self.grid_w + x
+        nuevo = 1 if self.grid[y][x] in self.walkable else 0
+        if nuevo == self.walk[i]:
+            return
+        self._km += self._h(self._last, self.start)
+        self._last = self.start
+        self.walk[i] = nuevo
+        self._update_vertex(i)
+        for s in self._vecinos(i):
+            self._update_vertex(s)
+        self.version += 1
+
+    def next_step(self, current):
+        i = current[1]*self.grid_w + current[0]
+        if i != self.start:
+            self.move_to(current)
+        self._compute()
+        if i == self.goal or self._g.get(i, INF) == INF:
+            return None
+        g, w = self._g, self.grid_w
+        best, best_c = None, INF
+        for s in self._vecinos(i):
+            c = self._costo(i, s) + g.get(s, INF)
+            if c < best_c:
+                best, best_c = s, c
+        return None if best is None else (best % w, best // w)
+
+    def path(self):
+        """Ruta completa (incluye la celda actual); [] si no hay camino."""
+        self._compute()
+        w = self.grid_w
+        i = self.start
+        if self._g.get(i, INF) == INF and i != self.goal:
+            return []
+        ruta = [(i % w, i // w)]
+        g = self._g
+        for _ in range(w * self.grid_h):
+            if i == self.goal:
+                return ruta
+            nxt, best_c = None, INF
+            for s in self._vecinos(i):
+                c = self._costo(i, s) + g.get(s, INF)
+                if c < best_c:
+                    nxt, best_c = s, c
+            if nxt is None:
+                return []
+            i = nxt
+            ruta.append((i % w, i // w))
+        return []
@@ -0,0 +1,310 @@
+# search.py
+# Registro de estrategias de búsqueda con una interfaz común:
+#   ruta, stats = buscar(nombre, grid, start, goal, grid_w, grid_h, walkable)
+# Todas trabajan sobre índices planos y devuelven la ruta (lista de celdas,
+# vacía si no hay camino) junto con un SearchStats: nodos expandidos,
+# inserciones en la frontera, pico de la frontera y tiempo en ns.
+# Sirve para elegir con números el algoritmo más barato por tipo de mapa.
+#
+# Uso:
+#   python search.py --niveles 200 --ancho 64 --alto 64
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # word importa pygame (no abre ventana)
+
+import argparse
+import random
+import sys
+from collections import deque
+from heapq import heappush, heappop
+from time import perf_counter_ns
+
+from agent import costos_planos, dial_flat
+from grid import Grid
+
+PESO_WASTAR = 2.0   # peso de la heurística en A* ponderado (ruta <= 2x la óptima)
+
+class SearchStats:
+    """Contadores de una búsqueda (se llenan mientras corre)."""
+    __slots__ = ("expandidos", "pushes", "pico_frontera", "ns", "longitud")
+
+    def __init__(self):
+        self.expandidos = 0      # nodos sacados de la frontera y procesados
+        self.pushes = 0          # inserciones en la cola / heap / pila
+        self.pico_frontera = 0   # tamaño máximo de la frontera
+        self.ns = 0              # tiempo total de la búsqueda
+        self.longitud = 0        # celdas de la ruta (0 = sin ruta)
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return ("SearchStats(" +
+                ", ".join(f"{k}={getattr(self, k)}" for k in self.__slots__) + ")")
+
+class Estrategia:
+    """Entrada del registro: nombre corto, etiqueta para la UI y función."""
+    __slots__ = ("nombre", "etiqueta", "fn")
+
+    def __init__(self, nombre, etiqueta, fn):
+        self.nombre = nombre
+        self.etiqueta = etiqueta
+        self.fn = fn
+
+    def __call__(self, grid, start, goal, grid_w, grid_h, walkable: set):
+        return self.fn(grid, start, goal, grid_w, grid_h, walkable)
+
+ESTRATEGIAS = {}   # nombre -> Estrategia (en orden de registro)
+
+def registrar(nombre, etiqueta, costos=False):
+    """
+    Decorador: registra fn(walk, s, t, w, n, stats) -> lista de índices.
+    La función registrada recibe la firma común (grid, start, goal, grid_w,
+    grid_h, walkable), mide el tiempo y devuelve (ruta, stats).
+    Con costos=True, 'walk' es el costo de terreno de cada celda
+    (agent.costos_planos; 0 = no caminable) en lugar de la máscara 0/1.
+    """
+    def deco(fn):
+        def buscar_con_stats(grid, start, goal, grid_w, grid_h, walkable: set):
+            stats = SearchStats()
+            t0 = perf_counter_ns()
+            if costos:
+                walk = costos_planos(grid, walkable)
+                s, t = start[1]*grid_w + start[0], goal[1]*grid_w + goal[0]
+            else:
+                walk, s, t = _preparar(grid, start, goal, grid_w, grid_h, walkable)
+            if s == t:
+                idxs = [s]
+            elif not walk[t]:
+                idxs = []
+            else:
+                idxs = fn(walk, s, t, grid_w, grid_w * grid_h, stats)
+            ruta = [(i % grid_w, i // grid_w) for i in idxs]
+            stats.ns = perf_counter_ns() - t0
+            stats.longitud = len(ruta)
+            return ruta, stats
+        buscar_con_stats.__name__ = f"{nombre}_busqueda"   # clave estable para PathCache
+        buscar_con_stats.__doc__ = fn.__doc__
+        ESTRATEGIAS[nombre] = Estrategia(nombre, etiqueta, buscar_con_stats)
+        return fn
+    return deco
+
+def obtener(nombre) -> Estrategia:
+    """Estrategia 'nombre' del registro; ValueError si no existe."""
+    try:
+        return ESTRATEGIAS[nombre]
+    except KeyError:
+        raise ValueError(f"estrategia desconocida: {nombre!r} (usa una de {tuple(ESTRATEGIAS)})") from None
+
+def buscar(nombre, grid, start, goal, grid_w, grid_h, walkable: set):
+    """Ejecuta la estrategia 'nombre' del registro. Devuelve (ruta, stats)."""
+    return obtener(nombre)(grid, start, goal, grid_w, grid_h, walkable)
+
+def estrategias():
+    """Lista de (nombre, etiqueta) registrados, para menús y CLIs."""
+    return [(e.nombre, e.etiqueta) for e in ESTRATEGIAS.values()]
+
+# ---------------------- utilidades ----------------------
+def _preparar(grid, start, goal, grid_w, grid_h, walkable):
+    """Máscara caminable plana (la celda inicial cuenta como caminable) e índices s, t."""
+    if isinstance(grid, Grid):
+        walk = bytearray(grid.walk_bytes(walkable))
+    else:
+        walk = bytearray(1 if c in walkable else 0 for fila in grid for c in fila)
+    s = start[1] * grid_w + start[0]
+    walk[s] = 1   # el tanque (TANK_C) arranca sobre su propia celda
+    return walk, s, goal[1] * grid_w + goal[0]
+
+def _vecinos(cur, w, n):
+    x = cur % w
+    if x + 1 < w: yield cur + 1
+    if x > 0:     yield cur - 1
+    if cur + w < n: yield cur + w
+    if cur >= w:  yield cur - w
+
+def _reconstruir(parent, t):
+    ruta = []
+    cur = t
+    while cur != -1:
+        ruta.append(cur)
+        cur = parent[cur]
+    ruta.reverse()
+    return ruta
+
+# ---------------------- estrategias ----------------------
+@registrar("dfs", "DFS aleatorio")
+def _dfs_aleatorio(walk, s, t, w, n, stats):
+    """DFS con orden de vecinos aleatorio: barato, pero la ruta no es óptima."""
+    parent = {}
+    pila = [(s, -1)]
+    stats.pushes = 1
+    while pila:
+        stats.pico_frontera = max(stats.pico_frontera, len(pila))
+        cur, padre = pila.pop()
+        if cur in parent:
+            continue
+        parent[cur] = padre
+        stats.expandidos += 1
+        if cur == t:
+            return _reconstruir(parent, t)
+        vecinos = [nb for nb in _vecinos(cur, w, n) if walk[nb] and nb not in parent]
+        random.shuffle(vecinos)
+        for nb in vecinos:
+            pila.append((nb, cur))
+        stats.pushes += len(vecinos)
+    return []
+
+@registrar("bfs", "BFS")
+def _bfs(walk, s, t, w, n, stats):
+    """BFS clásico: ruta óptima con costo uniforme, sin heurística."""
+    parent = {s: -1}
+    cola = deque((s,))
+    stats.pushes = 1
+    while cola:
+        stats.pico_frontera = max(stats.pico_frontera, len(cola))
+        cur = cola.popleft()
+        stats.expandidos += 1
+        if cur == t:
+            return _reconstruir(parent, t)
+        for nb in _vecinos(cur, w, n):
+            if walk[nb] and nb not in parent:
+                parent[nb] = cur
+                cola.append(nb)
+                stats.pushes += 1
+    return []
+
+def _mejor_primero(walk, s, t, w, n, stats, peso_g, peso_h):
+    """
+    Búsqueda best-first con f = peso_g*g + peso_h*h (h = Manhattan):
+    greedy (0, 1), A* (1, 1) y A* ponderado (1, PESO_WASTAR).
+    Los duplicados en el heap se descartan al sacarlos (g desactualizada).
+    """
+    gx, gy = t % w, t // w
+    g = {s: 0}
+    parent = {s: -1}
+    heap = [(0, 0, s)]
+    stats.pushes = 1
+    while heap:
+        stats.pico_frontera = max(stats.pico_frontera, len(heap))
+        _, gc, cur = heappop(heap)
+        if gc > g[cur]:
+            continue
+        stats.expandidos += 1
+        if cur == t:
+            return _reconstruir(parent, t)
+        tentative = gc + 1
+        for nb in _vecinos(cur, w, n):
+            if not walk[nb]:
+                continue
+            if peso_g == 0:
+                if nb in g:          # greedy: cada nodo entra una sola vez
+                    continue
+            elif tentative >= g.get(nb, tentative + 1):
+                continue
+            g[nb] = tentative
+            parent[nb] = cur
+            h = abs(nb % w - gx) + abs(nb // w - gy)
+            heappush(heap, (peso_g * tentative + peso_h * h, tentative, nb))
+            stats.pushes += 1
+    return []
+
+@registrar("greedy", "Greedy best-first")
+def _greedy(walk, s, t, w, n, stats):
+    """Greedy best-first (solo heurística): expande poco, ruta no óptima."""
+    return _mejor_primero(walk, s, t, w, n, stats, 0, 1)
+
+@registrar("astar", "A*")
+def _a_star(walk, s, t, w, n, stats):
+    """A* con heurística Manhattan: ruta óptima."""
+    return _mejor_primero(walk, s, t, w, n, stats, 1, 1)
+
+@registrar("wastar", f"A* ponderado (w={PESO_WASTAR:g})")
+def _a_star_ponderado(walk, s, t, w, n, stats):
+    """A* con la heurística inflada por PESO_WASTAR: menos expansiones, ruta acotada."""
+    return _mejor_primero(walk, s, t, w, n, stats, 1, PESO_WASTAR)
+
+@registrar("bibfs", "BFS bidireccional")
+def _bfs_bidireccional(walk, s, t, w, n, stats):
+    """
+    BFS desde start y desde goal a la vez, expandiendo por capas la frontera
+    más chica; termina al tocarse (ruta óptima, ~2*b^(d/2) nodos).
+    """
+    par_s = {s: -1}
+    par_t = {t: -1}
+    front_s, front_t = [s], [t]
+    stats.pushes = 2
+    while front_s and front_t:
+        stats.pico_frontera = max(stats.pico_frontera, len(front_s) + len(front_t))
+        desde_s = len(front_s) <= len(front_t)
+        frontera, propio, otro = ((front_s, par_s, par_t) if desde_s else
+                                  (front_t, par_t, par_s))
+        siguiente = []
+        for cur in frontera:
+            stats.expandidos += 1
+            for nb in _vecinos(cur, w, n):
+                if not walk[nb] or nb in propio:
+                    continue
+                propio[nb] = cur
+                if nb in otro:
+                    ida = _reconstruir(par_s, nb)
+                    vuelta = _reconstruir(par_t, nb)   # nb ... goal, al revés
+                    vuelta.reverse()
+                    return ida + vuelta[1:]
+                siguiente.append(nb)
+                stats.pushes += 1
+        if desde_s:
+            front_s = siguiente
+        else:
+            front_t = siguiente
+    return []
+
+@registrar("dial", "Dial (costo de terreno)", costos=True)
+def _dial(costo, s, t, w, n, stats):
+    """A* con cola de cubetas sobre agent.COSTOS_TERRENO: ruta de costo mínimo."""
+    return dial_flat(costo, s, t, w, n, stats)
+
+# ---------------------------- CLI ----------------------------
+def comparar(niveles: int, grid_w: int, grid_h: int, densidad_brick: float = 0.30,
+             densidad_grass: float = 0.15, seed0: int = 0, nombres=None):
+    """Promedio de stats por estrategia sobre 'niveles' niveles generados (seed0...)."""
+    import word
+    nombres = nombres or list(ESTRATEGIAS)
+    tot = {k: SearchStats() for k in nombres}
+    resueltos = dict.fromkeys(nombres, 0)
+    for seed in range(seed0, seed0 + niveles):
+        random.seed(seed)
+        grid, start, goal = word.generar_nivel(
+            grid_w, grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+            densidad_brick=densidad_brick, densidad_grass=densidad_grass,
+            como_grid=True, metodo="conexo")
+        for k in nombres:
+            ruta, st = buscar(k, grid, start, goal, grid_w, grid_h, word.WALKABLE)
+            acc = tot[k]
+            for campo in SearchStats.__slots__:
+                setattr(acc, campo, getattr(acc, campo) + getattr(st, campo))
+            resueltos[k] += bool(ruta)
+    return {k: ({c: v / niveles for c, v in tot[k].as_dict().items()}, resueltos[k])
+            for k in nombres}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Compara las estrategias de búsqueda sobre niveles generados.")
+    p.add_argument("--niveles", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0, help="primera seed del rango")
+    p.add_argument("--ancho", type=int, default=22)
+    p.add_argument("--alto", type=int, default=12)
+    p.add_argument("--densidad-brick", type=float, default=0.30)
+    p.add_argument("--densidad-grass", type=float, default=0.15)
+    p.add_argument("--estrategias", default=None,
+                   help=f"separadas por coma (por defecto todas: {','.join(ESTRATEGIAS)})")
+    a = p.parse_args(argv)
+
+    nombres = a.estrategias.split(",") if a.estrategias else None
+    res = comparar(a.niveles, a.ancho, a.alto, a.densidad_brick, a.densidad_grass, a.seed, nombres)
+    print(f"{'estrategia':<10} {'expandidos':>11} {'pushes':>9} {'pico':>7} "
+          f"{'longitud':>9} {'us':>9}  resueltos")
+    for k, (m, ok) in res.items():
+        print(f"{k:<10} {m['expandidos']:11.1f} {m['pushes']:9.1f} {m['pico_frontera']:7.1f} "
+              f"{m['longitud']:9.1f} {m['ns']/1e3:9.1f}  {ok}/{a.niveles}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
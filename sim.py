@@ -0,0 +1,156 @@
+# sim.py
+# Simulación headless: evalúa agentes sobre muchos niveles sin ventana y
+# sin reloj (cada paso se ejecuta de inmediato con step()).
+#
+# Uso:
+#   python sim.py --niveles 5000 --modo explorer --procesos 8 --csv res.csv
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # word importa pygame (no abre ventana)
+
+import argparse
+import csv
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from agent import RandomExplorer, CompactExplorer, jps_camino, RouteFollower
+from hpa import hpa_camino
+import search
+import word
+
+# explorers animados (podado: con poda por bitboards) + jps + hpa + cada
+# estrategia del registro de search.py
+MODOS = ("explorer", "compacto", "podado", "jps", "hpa") + tuple(search.ESTRATEGIAS)
+
+# ---------------------- un nivel ----------------------
+def simular_nivel(seed: int, modo: str = "explorer", grid_w: int = 22, grid_h: int = 12,
+                  densidad_brick: float = 0.30, densidad_grass: float = 0.15,
+                  max_pasos: int = 1_000_000, metodo: str = "conexo"):
+    """
+    Genera el nivel 'seed' y corre el agente hasta la meta (o 'max_pasos').
+    Devuelve un dict con: seed, modo, reached, steps, backtracks, wall_ms,
+    gen_intentos y gen_ms (lo que sumó este nivel a word.GEN_STATS) (y las estadísticas de la búsqueda si 'modo' es una estrategia de search.py).
+    """
+    random.seed(seed)
+    intentos0, gen_s0 = word.GEN_STATS.intentos, word.GEN_STATS.tiempo_s
+    t0 = time.perf_counter()
+    grid, start, goal = word.generar_nivel(
+        grid_w, grid_h, word.EMPTY, word.GRASS, word.BRICK, word.TANK_C, word.WIN_C,
+        densidad_brick=densidad_brick, densidad_grass=densidad_grass,
+        como_grid=True, metodo=metodo
+    )
+
+    stats = None
+    if modo == "explorer":
+        agente = RandomExplorer(grid, start, goal, grid_w, grid_h, word.WALKABLE)
+    elif modo == "compacto":
+        agente = CompactExplorer(grid, start, goal, grid_w, grid_h, word.WALKABLE)
+    elif modo == "podado":
+        agente = RandomExplorer(grid, start, goal, grid_w, grid_h, word.WALKABLE, podar=True)
+    elif modo == "jps":
+        agente = RouteFollower(jps_camino(grid, start, goal, grid_w, grid_h, word.WALKABLE))
+    elif modo == "hpa":
+        agente = RouteFollower(hpa_camino(grid, start, goal, grid_w, grid_h, word.WALKABLE))
+    elif modo in search.ESTRATEGIAS:
+        ruta, stats = search.buscar(modo, grid, start, goal, grid_w, grid_h, word.WALKABLE)
+        agente = RouteFollower(ruta)
+    else:
+        raise ValueError(f"modo desconocido: {modo!r} (usa uno de {MODOS})")
+
+    pasos = 0
+    while not agente.finished and pasos < max_pasos:
+        agente.step()
+        pasos += 1
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+
+    res = {
+        "seed": seed,
+        "modo": modo,
+        "reached": agente.cell == goal,
+        "steps": agente.i if isinstance(agente, RouteFollower) else agente.steps,
+        "backtracks": 0 if isinstance(agente, RouteFollower) else agente.backtracks,
+        "wall_ms": round(wall_ms, 3),
+        "gen_intentos": word.GEN_STATS.intentos - intentos0,
+        "gen_ms": round((word.GEN_STATS.tiempo_s - gen_s0) * 1000.0, 3),
+    }
+    if stats is not None:
+        res.update(expandidos=stats.expandidos, pushes=stats.pushes,
+                   pico_frontera=stats.pico_frontera, busqueda_ns=stats.ns)
+    return res
+
+def _simular_args(args):
+    return simular_nivel(*args)
+
+# ---------------------- muchos niveles ----------------------
+def simular_lote(seeds, modo: str = "explorer", grid_w: int = 22, grid_h: int = 12,
+                 densidad_brick: float = 0.30, densidad_grass: float = 0.15,
+                 max_pasos: int = 1_000_000, procesos=None, metodo: str = "conexo"):
+    """
+    Simula cada seed de 'seeds' repartiendo el trabajo en un pool de procesos
+    ('procesos'=1 ejecuta en el proceso actual). Devuelve la lista de
+    resultados en el mismo orden que 'seeds'.
+    """
+    trabajos = [(s, modo, grid_w, grid_h, densidad_brick, densidad_grass, max_pasos, metodo)
+                for s in seeds]
+    if procesos == 1:
+        return [_simular_args(t) for t in trabajos]
+
+    procesos = procesos or os.cpu_count() or 1
+    chunk = max(1, len(trabajos) // (procesos * 8))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(_simular_args, trabajos, chunksize=chunk))
+
+def resumen(resultados):
+    """
+    Promedios de pasos, backtracks y tiempo sobre los niveles resueltos, y de
+    la generación (intentos por nivel, ms por nivel) sobre todos.
+    """
+    ok = [r for r in resultados if r["reached"]]
+    n = len(ok) or 1
+    total = len(resultados) or 1
+    return {
+        "niveles": len(resultados),
+        "resueltos": len(ok),
+        "steps_medio": sum(r["steps"] for r in ok) / n,
+        "backtracks_medio": sum(r["backtracks"] for r in ok) / n,
+        "wall_ms_medio": sum(r["wall_ms"] for r in ok) / n,
+        "gen_intentos_medio": sum(r["gen_intentos"] for r in resultados) / total,
+        "gen_ms_medio": sum(r["gen_ms"] for r in resultados) / total,
+    }
+
+# ---------------------------- CLI ----------------------------
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Simulación headless de agentes Tank 1990.")
+    p.add_argument("--niveles", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=0, help="primera seed del rango")
+    p.add_argument("--modo", choices=MODOS, default="explorer")
+    p.add_argument("--ancho", type=int, default=22)
+    p.add_argument("--alto", type=int, default=12)
+    p.add_argument("--densidad-brick", type=float, default=0.30)
+    p.add_argument("--densidad-grass", type=float, default=0.15)
+    p.add_argument("--max-pasos", type=int, default=1_000_000)
+    p.add_argument("--metodo", choices=("conexo", "rechazo"), default="conexo",
+                   help="método de generación de niveles (ver word.generar_nivel)")
+    p.add_argument("--procesos", type=int, default=None)
+    p.add_argument("--csv", default=None, help="archivo donde guardar un resultado por nivel")
+    a = p.parse_args(argv)
+
+    t0 = time.perf_counter()
+    res = simular_lote(range(a.seed, a.seed + a.niveles), a.modo, a.ancho, a.alto,
+                       a.densidad_brick, a.densidad_grass, a.max_pasos, a.procesos, a.metodo)
+    total_s = time.perf_counter() - t0
+
+    if a.csv:
+        with open(a.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(res[0].keys()))
+            w.writeheader()
+            w.writerows(res)
+
+    for k, v in resumen(res).items():
+        print(f"{k}: {v:.2f}" if isinstance(v, float) else f"{k}: {v}")
+    print(f"tiempo total: {total_s:.2f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# timestep.py
+# Paso de simulación fijo, desacoplado del render: el bucle del juego
+# acumula el tiempo real del frame (x multiplicador de velocidad) y da
+# tantos pasos de agente como quepan, sin perder el tiempo sobrante.
+# El render sigue a la tasa de la pantalla y muestra el último estado.
+from time import perf_counter
+
+VELOCIDADES = (1, 10, 100, None)   # None = máximo (limitado solo por CPU)
+
+class FixedTimestep:
+    """
+    - step_ms: duración simulada de un paso (160 ms = 6.25 pasos/s a 1x).
+    - speed: multiplicador (1, 10, 100...) o None para "máx": en ese modo se
+      dan pasos hasta agotar 'presupuesto_ms' de CPU por frame.
+    - max_pasos_frame: tope de pasos por frame con multiplicador, para que
+      un frame lento no desencadene una espiral de recuperación; el tiempo
+      que no cabe se descarta.
+    """
+    def __init__(self, step_ms=160, speed=1, presupuesto_ms=10.0, max_pasos_frame=10_000):
+        self.step_ms = step_ms
+        self.speed = speed
+        self.presupuesto_ms = presupuesto_ms
+        self.max_pasos_frame = max_pasos_frame
+        self._accum = 0.0
+        self.pasos = 0             # pasos dados en total
+
+    @property
+    def etiqueta(self) -> str:
+        return "máx" if self.speed is None else f"x{self.speed}"
+
+    def set_speed(self, speed):
+        self.speed = speed
+        self._accum = 0.0
+
+    def siguiente_velocidad(self):
+        """Rota entre VELOCIDADES (1x -> 10x -> 100x -> máx -> 1x)."""
+        k = VELOCIDADES.index(self.speed) if self.speed in VELOCIDADES else -1
+        self.set_speed(VELOCIDADES[(k + 1) % len(VELOCIDADES)])
+
+    def reset(self):
+        self._accum = 0.0
+
+    def advance(self, dt_ms, step, done=lambda: False) -> int:
+        """
+        Avanza la simulación 'dt_ms' de tiempo real llamando a step() las
+        veces necesarias (hasta que done() sea True). Devuelve los pasos dados.
+        """
+        n = 0
+        if self.speed is None:
+            limite = perf_counter() + self.presupuesto_ms / 1000.0
+            while not done():
+                step()
+                n += 1
+                if (n & 63) == 0 and perf_counter() >= limite:
+                    break
+        else:
+            self._accum += dt_ms * self.speed
+            while self._accum >= self.step_ms and not done():
+                step()
+                n += 1
+                self._accum -= self.step_ms
+                if n >= self.max_pasos_frame:
+                    self._accum = 0.0
+                    break
+            if done():
+                self._accum = 0.0
+        self.pasos += n
+        return n
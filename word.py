@@ -1,9 +1,16 @@
 # word.py
 # Mundo: generación del mapa + utilidades de posicionamiento y dibujo.
 import random
+import threading
+import time
 from collections import deque
+import numpy as np
 import pygame
 
+# códigos de celda (los mismos que main.py) y grid compacto
+from grid import Grid, EMPTY, GRASS, BRICK, TANK_C, WIN_C, WALKABLE
+import bitboard
+
 # ---------- offsets para centrar la grilla ----------
 def grid_screen_offset(width: int, height: int, grid_w: int, grid_h: int, tile: int):
     bw = grid_w * tile
@@ -13,6 +20,20 @@ def grid_screen_offset(width: int, height: int, grid_w: int, grid_h: int, tile:
     return off_x, off_y
 
 # ---------- dibujar grilla y celdas ----------
+def _dibujar_celda(surface, cell, rect, dark_color, spr_grass, spr_brick, spr_win):
+    """Dibuja una sola celda (fondo, sprite y borde de rejilla) en 'rect'."""
+    if cell == 1:      # GRASS
+        surface.blit(spr_grass, rect.topleft)
+    else:
+        pygame.draw.rect(surface, dark_color, rect, 0)
+
+    if cell == 2:      # BRICK
+        surface.blit(spr_brick, rect.topleft)
+    elif cell == 4:    # WIN
+        surface.blit(spr_win, rect.topleft)
+
+    pygame.draw.rect(surface, (40,40,40), rect, 1)  # rejilla sutil
+
 def dibujar_grid(surface, grid, grid_w: int, grid_h: int, tile: int,
                  dark_color, spr_grass, spr_brick, spr_win, off_x: int, off_y: int):
     """
@@ -21,19 +42,7 @@ def dibujar_grid(surface, grid, grid_w: int, grid_h: int, tile: int,
     for y in range(grid_h):
         for x in range(grid_w):
             rect = pygame.Rect(off_x + x*tile, off_y + y*tile, tile, tile)
-            cell = grid[y][x]
-
-            if cell == 1:      # GRASS
-                surface.blit(spr_grass, rect.topleft)
-            else:
-                pygame.draw.rect(surface, dark_color, rect, 0)
-
-            if cell == 2:      # BRICK
-                surface.blit(spr_brick, rect.topleft)
-            elif cell == 4:    # WIN
-                surface.blit(spr_win, rect.topleft)
-
-            pygame.draw.rect(surface, (40,40,40), rect, 1)  # rejilla sutil
+            _dibujar_celda(surface, grid[y][x], rect, dark_color, spr_grass, spr_brick, spr_win)
 
 # ---------- generación del nivel ----------
 def _vecinos_cardinales(x, y, grid_w, grid_h):
@@ -42,7 +51,28 @@ def _vecinos_cardinales(x, y, grid_w, grid_h):
     if y + 1 < grid_h: yield (x, y + 1)
     if y - 1 >= 0:     yield (x, y - 1)
 
+def _hay_camino_bfs_flat(grid: Grid, start, goal, walkable):
+    """BFS sobre índices planos y la máscara del Grid (sin tuplas ni sets)."""
+    w, n = grid.w, grid.w * grid.h
+    walk = grid.walk_bytes(walkable)
+    s = grid.idx(*start)
+    g = grid.idx(*goal)
+    vis = bytearray(n)
+    vis[s] = 1
+    q = deque([s])
+    while q:
+        i = q.popleft()
+        if i == g: return True
+        x = i % w
+        for j in (i + 1 if x + 1 < w else -1, i - 1 if x > 0 else -1, i + w, i - w):
+            if 0 <= j < n and not vis[j] and walk[j]:
+                vis[j] = 1
+                q.append(j)
+    return False
+
 def _hay_camino_bfs(grid, start, goal, grid_w, grid_h, walkable={0,1,4}):
+    if isinstance(grid, Grid):
+        return _hay_camino_bfs_flat(grid, start, goal, walkable)
     sx, sy = start
     gx, gy = goal
     q = deque([(sx, sy)])
@@ -56,15 +86,90 @@ def _hay_camino_bfs(grid, start, goal, grid_w, grid_h, walkable={0,1,4}):
                 q.append((nx, ny))
     return False
 
+def _hay_camino(grid, start, goal, grid_w, grid_h, walkable={0,1,4}):
+    """Mismo resultado que _hay_camino_bfs, inundando con bitboards (ver bitboard.py)."""
+    if isinstance(grid, Grid):
+        mask = np.frombuffer(grid.walk_bytes(walkable), dtype=bool).reshape(grid_h, grid_w)
+    else:
+        mask = np.isin(np.array(grid, dtype=np.uint8), list(walkable))
+    return bitboard.hay_camino(mask, start, goal)
+
+class GenStats:
+    """
+    Contadores acumulados de generar_nivel (para comparar métodos):
+    niveles generados, intentos, intentos aceptados y tiempo total.
+    Se actualiza también desde el hilo de prefetch, por eso el lock.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.niveles = 0
+            self.intentos = 0
+            self.aceptados = 0
+            self.tiempo_s = 0.0
+
+    def registrar(self, intentos: int, aceptado: bool, tiempo_s: float):
+        with self._lock:
+            self.niveles += 1
+            self.intentos += intentos
+            self.aceptados += 1 if aceptado else 0
+            self.tiempo_s += tiempo_s
+
+    @property
+    def tasa_aceptacion(self) -> float:
+        return self.aceptados / self.intentos if self.intentos else 0.0
+
+    @property
+    def ms_por_nivel(self) -> float:
+        return 1000.0 * self.tiempo_s / self.niveles if self.niveles else 0.0
+
+    def as_dict(self):
+        with self._lock:
+            return {"niveles": self.niveles, "intentos": self.intentos,
+                    "tasa_aceptacion": self.tasa_aceptacion, "ms_por_nivel": self.ms_por_nivel}
+
+GEN_STATS = GenStats()
+
 def generar_nivel(grid_w: int, grid_h: int,
                   empty: int, grass: int, brick: int, tank_c: int, win_c: int,
                   densidad_brick: float = 0.30, densidad_grass: float = 0.15,
-                  max_intentos: int = 200):
+                  max_intentos: int = 200, como_grid: bool = False,
+                  metodo: str = "rechazo"):
     """
     Genera un grid aleatorio con BRICK/GRASS y coloca TANK_C (start) y WIN_C (goal).
-    Repite hasta que exista camino válido entre TANK y WIN.
+    - metodo="rechazo": repite hasta que exista camino válido entre TANK y WIN.
+    - metodo="conexo":  una sola pasada (sorteo vectorizado + componente del
+      start); la meta se elige dentro de esa componente o se talla un pasillo.
+    En ambos la conectividad se calcula con bitboards (bitboard.py).
+    Con como_grid=True devuelve un Grid (NumPy) en vez de list[list[int]].
+    Cada llamada se acumula en GEN_STATS.
     """
-    for _ in range(max_intentos):
+    t0 = time.perf_counter()
+    if metodo == "conexo":
+        cells, start, goal = _generar_conexo(grid_w, grid_h, empty, grass, brick, tank_c, win_c,
+                                             densidad_brick, densidad_grass)
+        GEN_STATS.registrar(1, True, time.perf_counter() - t0)
+        grid = Grid(cells, {empty, grass, win_c}) if como_grid else cells.tolist()
+        return grid, start, goal
+    if metodo != "rechazo":
+        raise ValueError(f"metodo desconocido: {metodo!r}")
+
+    grid, start, goal, intentos, ok = _generar_rechazo(
+        grid_w, grid_h, empty, grass, brick, tank_c, win_c,
+        densidad_brick, densidad_grass, max_intentos)
+    GEN_STATS.registrar(intentos, ok, time.perf_counter() - t0)
+    if como_grid:
+        grid = Grid.from_list(grid, {empty, grass, win_c})
+    return grid, start, goal
+
+def _generar_rechazo(grid_w, grid_h, empty, grass, brick, tank_c, win_c,
+                     densidad_brick, densidad_grass, max_intentos):
+    """Método original: sortea y valida el camino hasta max_intentos.
+    Devuelve (grid, start, goal, intentos, aceptado)."""
+    for intento in range(1, max_intentos + 1):
         grid = [[empty for _ in range(grid_w)] for _ in range(grid_h)]
 
         for y in range(grid_h):
@@ -89,8 +194,8 @@ def generar_nivel(grid_w: int, grid_h: int,
         for nx, ny in _vecinos_cardinales(*goal, grid_w, grid_h):
             if grid[ny][nx] == brick: grid[ny][nx] = empty
 
-        if _hay_camino_bfs(grid, start, goal, grid_w, grid_h, {empty, grass, win_c}):
-            return grid, start, goal
+        if _hay_camino(grid, start, goal, grid_w, grid_h, {empty, grass, win_c}):
+            return grid, start, goal, intento, True
 
     # Fallback (pasillo)
     grid = [[empty for _ in range(grid_w)] for _ in range(grid_h)]
@@ -100,4 +205,58 @@ def generar_nivel(grid_w: int, grid_h: int,
     goal  = (grid_w-1, gy)
     grid[sy][0] = tank_c
     grid[gy][grid_w-1] = win_c
-    return grid, start, goal
+    return grid, start, goal, max_intentos, False
+
+def _despejar(cells, x, y, brick, empty):
+    """Quita BRICK de los vecinos cardinales de (x, y)."""
+    h, w = cells.shape
+    for nx, ny in _vecinos_cardinales(x, y, w, h):
+        if cells[ny, nx] == brick: cells[ny, nx] = empty
+
+def _generar_conexo(grid_w, grid_h, empty, grass, brick, tank_c, win_c,
+                    densidad_brick, densidad_grass):
+    """Generación en una pasada: nunca descarta niveles. Devuelve (cells, start, goal)."""
+    # sorteo vectorizado (semilla derivada de 'random' para que random.seed lo reproduzca)
+    rng = np.random.default_rng(random.getrandbits(64))
+    r = rng.random((grid_h, grid_w))
+    cells = np.full((grid_h, grid_w), empty, dtype=np.uint8)
+    cells[r < densidad_brick + densidad_grass] = grass
+    cells[r < densidad_brick] = brick
+
+    sy = random.randint(0, grid_h-1)
+    start = (0, sy)
+    cells[sy, 0] = tank_c
+    _despejar(cells, 0, sy, brick, empty)
+
+    walk = np.isin(cells, (empty, grass, win_c))
+    walk[sy, 0] = True
+    comp = bitboard.componente(walk, start)
+
+    # filas de la última columna cuya meta quedaría tocando la componente
+    col = comp[:, -1]
+    cand = col.copy()
+    if grid_w > 1: cand |= comp[:, -2]
+    cand[1:] |= col[:-1]
+    cand[:-1] |= col[1:]
+    cand[sy] &= grid_w > 1  # no pisar el start en mapas de una columna
+    filas = np.flatnonzero(cand)
+
+    if len(filas):
+        gy = int(filas[random.randrange(len(filas))])
+    else:
+        # sin meta alcanzable: tallar el pasillo más corto desde la celda
+        # alcanzable más cercana (en Manhattan) hasta una meta al azar
+        gy = random.randint(0, grid_h-1)
+        ys, xs = np.nonzero(comp)
+        k = int(np.argmin(np.abs(xs - (grid_w-1)) + np.abs(ys - gy)))
+        x, y = int(xs[k]), int(ys[k])
+        paso = 1 if gy >= y else -1
+        for yy in range(y, gy + paso, paso):
+            if cells[yy, x] == brick: cells[yy, x] = empty
+        for xx in range(x, grid_w):
+            if cells[gy, xx] == brick: cells[gy, xx] = empty
+
+    goal = (grid_w-1, gy)
+    cells[gy, grid_w-1] = win_c
+    _despejar(cells, grid_w-1, gy, brick, empty)
+    return cells, start, goal